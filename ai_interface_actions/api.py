@@ -2,6 +2,11 @@
 API FastAPI pour l'automatisation des plateformes IA
 """
 import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
 import time
 import hashlib
 import tempfile
@@ -9,6 +14,7 @@ import os
 from contextlib import asynccontextmanager
 from typing import Dict, Any, Set
 
+import orjson
 import structlog
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
@@ -20,9 +26,15 @@ from ai_interface_actions.models import (
     FileUploadRequest, FileUploadResponse, ZipUrlUploadRequest
 )
 from ai_interface_actions.task_manager import task_manager
-from ai_interface_actions.browser_automation import browser_manager
+from ai_interface_actions.browser_automation import browser_manager, stop_shared_playwright
+from ai_interface_actions.credentials_client import credentials_client
 from ai_interface_actions.admin_routes import router as admin_router
 
+def _orjson_dumps(event_dict: Dict[str, Any], **kwargs) -> str:
+    """Sérialiseur JSON des logs (orjson, renvoie une chaîne pour le logging stdlib)"""
+    return orjson.dumps(event_dict, default=kwargs.get("default")).decode()
+
+
 # Configuration du logging
 structlog.configure(
     processors=[
@@ -34,13 +46,21 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps)
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
     cache_logger_on_first_use=True,
 )
 
+# Les logs stdlib passent par une file : la boucle d'événements ne fait qu'empiler l'enregistrement,
+# l'écriture sur stderr est faite par le thread du QueueListener
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stderr))
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = structlog.get_logger(__name__)
 
 # Variable pour tracker le temps de démarrage
@@ -113,6 +133,8 @@ async def lifespan(app: FastAPI):
     logger.info("Arrêt de l'application")
     try:
         await browser_manager.cleanup()
+        await stop_shared_playwright()
+        await credentials_client.aclose()
         logger.info("Ressources nettoyées avec succès")
     except Exception as e:
         logger.error("Erreur lors du nettoyage", error=str(e))
@@ -302,6 +324,7 @@ async def debug_session_status():
     
     Utile pour diagnostiquer les problèmes de connexion et credentials
     """
+    page = None
     try:
         logger.info("🔍 Début du diagnostic de session")
         
@@ -316,7 +339,8 @@ async def debug_session_status():
         
         # Naviguer vers Manus.ai
         logger.info("Navigation vers Manus.ai pour diagnostic")
-        await page.goto(settings.manus_base_url, wait_until="networkidle", timeout=settings.page_timeout)
+        await page.goto(settings.manus_base_url, wait_until="domcontentloaded", timeout=settings.page_timeout)
+        await browser_manager._wait_for_message_input_ready(page)
         
         # Collecter les informations de diagnostic
         diagnostic_info = await page.evaluate("""
@@ -386,6 +410,9 @@ async def debug_session_status():
             "timestamp": time.time(),
             "browser_initialized": browser_manager.is_initialized if 'browser_manager' in locals() else False
         }
+    finally:
+        if page is not None:
+            await browser_manager._checkin_page(page)
 
 
 @app.post("/setup-login")
@@ -598,7 +625,7 @@ async def upload_zip_from_url(request: ZipUrlUploadRequest):
         # Télécharger le fichier .zip
         logger.info("Téléchargement du fichier .zip depuis l'URL")
         try:
-            temp_file_path, original_filename = zip_downloader.download_zip_from_url(request.zip_url)
+            temp_file_path, original_filename = await zip_downloader.download_zip_from_url_async(request.zip_url)
         except Exception as e:
             logger.error("Erreur lors du téléchargement", zip_url=request.zip_url, error=str(e))
             raise HTTPException(status_code=400, detail=f"Erreur de téléchargement: {str(e)}")
@@ -926,8 +953,6 @@ async def simulate_request(message: str = "Test message", client_ip: str = "127.
     Simule une requête pour tester la déduplication
     """
     try:
-        from ai_interface_actions.models import MessageRequest
-        
         # Créer une requête simulée
         request = MessageRequest(
             message=message,
@@ -1012,6 +1037,10 @@ async def test_conversation_reuse(conversation_url: str, message: str = "Test de
     """
     Teste la réutilisation d'une conversation existante
     """
+    # Une URL vide emprunterait une page au pool de nouvelles conversations sans jamais la rendre
+    if browser_manager._is_new_conversation(conversation_url):
+        raise HTTPException(status_code=400, detail="conversation_url requise")
+    
     try:
         if not browser_manager.is_initialized:
             return {
@@ -1031,6 +1060,7 @@ async def test_conversation_reuse(conversation_url: str, message: str = "Test de
         
         # Tester la récupération/création de page
         page = await browser_manager._get_or_create_page(conversation_url)
+        await browser_manager._checkin_page(page)
         page_was_reused = not page_exists and conversation_url in browser_manager.active_pages
         
         return {
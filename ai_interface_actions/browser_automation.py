@@ -2,17 +2,571 @@
 Module d'automatisation du navigateur avec Playwright
 """
 import asyncio
+import base64
+import functools
 import os
+import tempfile
 import structlog
 import json
+import logging
 from pathlib import Path
 from typing import Optional, Dict, Any, List
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, TimeoutError
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright, Playwright, Browser, BrowserContext, Page, TimeoutError
 
 from ai_interface_actions.config import settings
-from ai_interface_actions.credentials_client import CredentialsAPIClient
+from ai_interface_actions.credentials_client import credentials_client
 
 logger = structlog.get_logger(__name__)
+# Logger stdlib sous-jacent : sert uniquement à tester le niveau DEBUG avant les logs par sélecteur
+_stdlib_logger = logging.getLogger(__name__)
+
+# Paramètres lus à chaque requête, figés à l'import (la configuration n'est jamais modifiée à chaud)
+_MANUS_BASE_URL = settings.manus_base_url
+_PAGE_TIMEOUT_MS = settings.page_timeout
+
+# Driver Playwright (processus Node) partagé par toutes les instances du processus
+_shared_playwright: Optional[Playwright] = None
+_shared_playwright_lock: Optional[asyncio.Lock] = None
+
+
+async def get_shared_playwright() -> Playwright:
+    """Démarre le driver Playwright au premier appel puis le réutilise"""
+    global _shared_playwright, _shared_playwright_lock
+    if _shared_playwright_lock is None:
+        _shared_playwright_lock = asyncio.Lock()
+    async with _shared_playwright_lock:
+        if _shared_playwright is None:
+            _shared_playwright = await async_playwright().start()
+            logger.info("Driver Playwright démarré")
+        return _shared_playwright
+
+
+async def stop_shared_playwright() -> None:
+    """Arrête le driver Playwright partagé (à l'arrêt de l'application)"""
+    global _shared_playwright
+    if _shared_playwright is not None:
+        await _shared_playwright.stop()
+        _shared_playwright = None
+        logger.info("Driver Playwright arrêté")
+
+
+# Signatures possibles en tête d'une archive ZIP (locale, archive vide, archive fractionnée)
+_ZIP_MAGIC_NUMBERS = (b"PK\x03\x04", b"PK\x05\x06", b"PK\x07\x08")
+
+
+def _is_valid_zip(path: str) -> bool:
+    """Vérifie la signature ZIP en ne lisant que les 4 premiers octets du fichier"""
+    with open(path, "rb") as f:
+        return f.read(4) in _ZIP_MAGIC_NUMBERS
+
+
+@functools.lru_cache(maxsize=256)
+def _conversation_id_from_url(url: str) -> str:
+    """Extrait (et mémorise) l'ID de conversation d'une URL Manus.im"""
+    if "/app/" in url:
+        return url.split("/app/")[-1].split("?")[0].split("#")[0]
+    return ""
+
+
+# Sélecteurs ULTRA-PERMISSIFS - priorité aux plus spécifiques
+# Tous les placeholders connus de Manus.ai (français et anglais)
+_SPECIFIC_SELECTORS = [
+    # Français - tous les variants possibles
+    "textarea[placeholder='Attribuez une tâche ou posez une question']",
+    "textarea[placeholder*='Attribuez une tâche ou posez une question']",
+    "textarea[placeholder*='Attribuez une tâche']",
+    "textarea[placeholder*='posez une question']", 
+    "textarea[placeholder*='Attribuez']",
+    "textarea[placeholder*='tâche']",
+    "textarea[placeholder*='question']",
+    
+    # Anglais - tous les variants possibles
+    "textarea[placeholder='Assign a task or ask anything']",
+    "textarea[placeholder*='Assign a task or ask anything']",
+    "textarea[placeholder*='Assign a task']",
+    "textarea[placeholder*='ask anything']",
+    "textarea[placeholder*='Assign']",
+    "textarea[placeholder*='task']",
+    "textarea[placeholder*='anything']",
+    
+    # Messages dans conversations
+    "textarea[placeholder*='Send message to Manus']",
+    "textarea[placeholder*='Send message']",
+    "textarea[placeholder*='message to Manus']",
+    "textarea[placeholder*='Envoyer un message']",
+    "textarea[placeholder*='Écrivez votre message']",
+    
+    # Génériques message
+    "textarea[placeholder*='message']",
+    "textarea[placeholder*='Message']",
+    "textarea[placeholder*='Tapez']",
+    "textarea[placeholder*='Type']",
+    "textarea[placeholder*='Écrivez']",
+    "textarea[placeholder*='Write']",
+]
+
+# Sélecteurs génériques TRÈS permissifs (fallback ultime)
+_FALLBACK_SELECTORS = [
+    # Inputs alternatifs
+    "input[placeholder*='message']",
+    "input[placeholder*='Message']", 
+    "input[placeholder*='tâche']",
+    "input[placeholder*='task']",
+    
+    # Contenteditable
+    "[contenteditable='true']",
+    "div[contenteditable='true']",
+    
+    # Textarea par structure
+    "textarea:not([readonly]):not([disabled])",
+    "textarea:not([style*='display: none']):not([style*='display:none'])",
+    "textarea[rows]",
+    "textarea.resize-none",
+    "textarea[class*='input']",
+    "textarea[class*='chat']",
+    "textarea[class*='message']",
+    
+    # Par classes CSS communes
+    ".message-input textarea",
+    ".chat-input textarea", 
+    ".input-container textarea",
+    ".text-input textarea",
+    
+    # Par IDs
+    "#message-input",
+    "#chat-input",
+    "#text-input",
+    
+    # Avec attributs spéciaux
+    "textarea[data-testid]",
+    "textarea[aria-label]",
+    "div[data-dashlane-rid] textarea",
+    
+    # Derniers recours - tout textarea visible
+    "textarea",
+]
+
+# Ordre complet de recherche du champ de saisie : spécifiques puis fallbacks
+_ALL_INPUT_SELECTORS = _SPECIFIC_SELECTORS + _FALLBACK_SELECTORS
+
+# Mots-clés de placeholder couvrant tous les sélecteurs spécifiques (chaque variante longue contient l'un d'eux)
+_PLACEHOLDER_KEYWORDS = (
+    "Attribuez", "tâche", "question", "Assign", "task", "anything",
+    "message", "Message", "Envoyer", "Écrivez", "Tapez", "Type", "Write",
+)
+
+# Union CSS dédupliquée des sélecteurs spécifiques : un seul querySelectorAll côté navigateur
+_SPECIFIC_SELECTOR_UNION = ", ".join(f"textarea[placeholder*='{keyword}']" for keyword in _PLACEHOLDER_KEYWORDS)
+
+# Sélecteurs possibles pour le bouton d'envoi, interrogés en une seule union
+_SEND_BUTTON_SELECTORS = [
+    "button:has-text('Send')",
+    "button:has-text('Envoyer')",
+    "button[type='submit']",
+    "[data-testid='send-button']",
+    ".send-button",
+    "button:has([data-icon='send'])"
+]
+_SEND_BUTTON_UNION = ", ".join(_SEND_BUTTON_SELECTORS)
+
+# Messages du fil de conversation (utilisateur et IA)
+_MESSAGE_SELECTOR_UNION = ".message, .chat-message, .ai-response, [data-role='assistant']"
+
+# Confirmation d'envoi en un seul polling : bouton désactivé/retiré OU nouveau message dans le fil
+_SEND_CONFIRM_JS = """
+([button, messageSelector, initialCount]) =>
+    !button.isConnected ||
+    button.disabled ||
+    document.querySelectorAll(messageSelector).length > initialCount
+"""
+
+# Champ de saisie focalisé : [texte, nombre de messages du fil], ou null si le focus n'est pas sur un champ
+_FOCUSED_INPUT_SNAPSHOT_JS = """
+(messageSelector) => {
+    const el = document.activeElement;
+    if (!el || !(el.tagName === 'TEXTAREA' || el.isContentEditable)) return null;
+    return [(el.value !== undefined ? el.value : el.innerText) || '', document.querySelectorAll(messageSelector).length];
+}
+"""
+
+# Même relevé sur un champ donné (après Entrée, le focus peut avoir changé)
+_INPUT_SNAPSHOT_JS = """
+(el, messageSelector) => [
+    el.isConnected ? ((el.value !== undefined ? el.value : el.innerText) || '') : '',
+    document.querySelectorAll(messageSelector).length
+]
+"""
+
+# Envoi via Entrée confirmé : champ vidé/retiré OU nouveau message dans le fil
+_ENTER_SENT_JS = """
+([el, messageSelector, initialCount]) =>
+    !el.isConnected ||
+    ((el.value !== undefined ? el.value : el.innerText) || '').trim().length === 0 ||
+    document.querySelectorAll(messageSelector).length > initialCount
+"""
+
+# Attente max de la confirmation d'un envoi via Entrée avant de considérer le bouton (ms)
+_ENTER_CONFIRM_TIMEOUT_MS = 2000
+
+# Indicateurs de NON-connexion
+_LOGIN_INDICATORS = [
+    "input[type='email']",
+    "input[name='email']",
+    "button:has-text('Sign in')",
+    "button:has-text('Login')",
+    "button:has-text('Se connecter')"
+]
+_LOGIN_INDICATOR_UNION = ", ".join(_LOGIN_INDICATORS)
+
+# Éléments de l'interface connectée
+# Champ de saisie : n'apparaît que pour un utilisateur connecté (contrairement à nav, sidebar...)
+_CONNECTED_INPUT_INDICATORS = [
+    "textarea[placeholder*='Attribuez une tâche']",  # Sélecteur spécifique Manus.ai
+    "textarea[placeholder*='posez une question']",   # Sélecteur spécifique Manus.ai
+    "textarea[placeholder*='message']",
+    "input[placeholder*='message']",
+    "textarea[placeholder*='Message']",
+    "input[placeholder*='Message']",
+    ".chat-input",
+    "[data-testid='chat-input']",
+]
+_CONNECTED_INPUT_UNION = ", ".join(_CONNECTED_INPUT_INDICATORS)
+
+_CONNECTED_INDICATORS = _CONNECTED_INPUT_INDICATORS + [
+    "button[data-testid='new-chat']",
+    ".new-chat",
+    ".sidebar",
+    "[data-testid='sidebar']",
+    ".user-menu",
+    "[data-testid='user-menu']",
+    "nav"
+]
+_CONNECTED_INDICATOR_UNION = ", ".join(_CONNECTED_INDICATORS)
+
+# Course entre le formulaire de login et le champ de saisie (les éléments génériques de mise en page
+# comme nav apparaissent souvent avant le formulaire de login et ne tranchent rien)
+_LOGIN_STATUS_UNION = f"{_LOGIN_INDICATOR_UNION}, {_CONNECTED_INPUT_UNION}"
+
+# Délai laissé au formulaire de login quand seuls des éléments génériques sont présents (ms)
+_LOGIN_FORM_GRACE_MS = 1500
+
+# Indicateurs de déconnexion (vérification avant upload)
+_LOGGED_OUT_INDICATORS = [
+    "text=Se connecter", "text=Sign in", "text=Login",
+    "input[type='email']", "input[type='password']",
+    "button:has-text('Se connecter')", "button:has-text('Sign in')"
+]
+
+# Sélecteurs pour les messages de réponse de l'IA
+_RESPONSE_SELECTORS = [
+    ".message:last-child",
+    ".chat-message:last-child",
+    ".ai-response:last-child",
+    "[data-role='assistant']:last-child"
+]
+
+# Sélecteurs pour détecter le popup Wide Research
+_WIDE_RESEARCH_SELECTORS = [
+    # Texte spécifique "Wide Research"
+    "text=Wide Research",
+    # Container avec l'image spécifique
+    "img[src*='mapReduceDarkIcon']",
+    # Texte "Analyse complète de tous les documents"
+    "text=Analyse complète de tous les documents",
+    # Container général du popup
+    "div:has-text('Wide Research coûtera')",
+]
+
+# Sélecteurs pour le lien "continuer sans Wide Research"
+_SKIP_WIDE_RESEARCH_SELECTORS = [
+    # Texte exact
+    "a:has-text('ou continuer sans Wide Research')",
+    # Lien avec classe cursor-pointer et underline
+    "a.cursor-pointer.underline:has-text('continuer sans Wide Research')",
+    # Texte partiel
+    "a:has-text('continuer sans')",
+    # Fallback avec tabindex
+    "a[tabindex='0']:has-text('continuer')",
+    # Très permissif
+    "a:has-text('Wide Research')",
+]
+
+# État de plusieurs éléments en un seul evaluate_all (visibilité proche de celle de Playwright)
+_ELEMENT_STATES_JS = """
+elements => elements.map(el => ({
+    visible: el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden',
+    disabled: !!el.disabled,
+    placeholder: el.getAttribute('placeholder'),
+    text: el.textContent
+}))
+"""
+
+# État du premier élément de chaque sélecteur, calculé en un seul aller-retour
+_SELECTOR_STATES_JS = """
+selectors => selectors.map(selector => {
+    const elements = document.querySelectorAll(selector);
+    const el = elements[0];
+    return {
+        count: elements.length,
+        visible: !!el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden',
+        disabled: !!el && !!el.disabled
+    };
+})
+"""
+
+# Diagnostic des champs de saisie présents sur la page (en cas d'échec de détection)
+_INPUT_DIAGNOSTIC_JS = """
+() => {
+    // Chercher tous les textarea et input
+    const textareas = Array.from(document.querySelectorAll('textarea'));
+    const inputs = Array.from(document.querySelectorAll('input'));
+    
+    return {
+        url: location.href,
+        title: document.title,
+        textareas: textareas.map(t => ({
+            placeholder: t.placeholder,
+            visible: t.offsetParent !== null,
+            disabled: t.disabled
+        })),
+        inputs: inputs.map(i => ({
+            type: i.type,
+            placeholder: i.placeholder,
+            visible: i.offsetParent !== null,
+            disabled: i.disabled
+        })),
+        bodyText: document.body.innerText.substring(0, 500)
+    };
+}
+"""
+
+# Attente de la réponse IA dans la page : réévaluée à chaque mutation du DOM,
+# résolue ({text, selector}) quand le texte du dernier message n'a plus changé depuis settleMs
+_AI_RESPONSE_WAIT_JS = """
+([selectors, timeoutMs, settleMs]) => new Promise(resolve => {
+    const find = () => {
+        for (const selector of selectors) {
+            const elements = document.querySelectorAll(selector);
+            const last = elements[elements.length - 1];
+            if (last && last.getClientRects().length > 0) {
+                const text = (last.textContent || '').trim();
+                if (text) return {text, selector};
+            }
+        }
+        return null;
+    };
+    let current = null;
+    let settleTimer = null;
+    const finish = value => {
+        observer.disconnect();
+        clearTimeout(settleTimer);
+        clearTimeout(deadline);
+        resolve(value);
+    };
+    const check = () => {
+        const found = find();
+        if (found !== null && (current === null || found.text !== current.text)) {
+            current = found;
+            clearTimeout(settleTimer);
+            settleTimer = setTimeout(() => finish(current), settleMs);
+        }
+    };
+    const observer = new MutationObserver(check);
+    // À l'échéance, renvoyer le dernier texte vu (même encore en cours de génération)
+    const deadline = setTimeout(() => finish(current), timeoutMs);
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    check();
+})
+"""
+
+# Délai sans modification du texte avant de considérer la réponse IA comme complète (ms)
+_AI_RESPONSE_SETTLE_MS = 500
+
+# Zones de drop candidates, par niveau de priorité : chaque niveau est une seule liste CSS
+# (le premier élément dans l'ordre du document l'emporte au sein d'un niveau)
+_DROP_ZONE_SELECTOR_TIERS = tuple(", ".join(tier) for tier in (
+    # Sélecteurs spécifiques Manus.ai
+    (
+        'textarea[placeholder="Attribuez une tâche ou posez une question"]',
+        'textarea[placeholder="Assign a task or ask anything"]',
+        'textarea[placeholder*="Attribuez"]',
+        'textarea[placeholder*="Assign"]',
+        'textarea[placeholder*="tâche"]',
+        'textarea[placeholder*="task"]',
+        'textarea[placeholder*="question"]',
+        'textarea[placeholder*="anything"]',
+        'textarea[placeholder*="posez"]',
+        'textarea[placeholder*="message"]',
+        'textarea[placeholder*="Message"]',
+        'textarea[placeholder*="Send message"]',
+        'textarea[placeholder*="Envoyer"]',
+        'textarea[placeholder*="Écrivez"]',
+        'textarea[placeholder*="Write"]',
+    ),
+    # Sélecteurs génériques
+    (
+        'textarea:not([readonly]):not([disabled])',
+        'textarea[rows]',
+        'textarea.resize-none',
+        'input[type="text"]:not([readonly]):not([disabled])',
+        '[contenteditable="true"]',
+    ),
+    # Conteneurs
+    (
+        '.chat-input-container',
+        '.message-input-container',
+        '.input-container',
+        '.chat-container',
+        '.text-input-container',
+    ),
+    # Fallbacks larges (ordre conservé : body contient tout le reste)
+    ('.main-content',),
+    ('main',),
+    ('body',),
+))
+
+# Upload de secours par drag & drop simulé : reconstruit le fichier (base64) et le dépose sur la zone de saisie
+_DROP_FILE_JS = """
+async (fileData) => {
+    const { fileName, fileBase64, dropZoneTiers } = fileData;
+
+    try {
+        // Créer un objet File à partir du contenu base64
+        const uint8Array = Uint8Array.from(atob(fileBase64), c => c.charCodeAt(0));
+        const file = new File([uint8Array], fileName, { 
+            type: 'application/zip',
+            lastModified: Date.now()
+        });
+    
+        // Chercher la zone de drop - ULTRA-PERMISSIF
+        // Un seul querySelector par niveau de priorité (listes CSS pré-assemblées côté Python)
+        let dropZone = null;
+        for (const tier of dropZoneTiers) {
+            dropZone = document.querySelector(tier);
+            if (dropZone) break;
+        }
+    
+        if (!dropZone) {
+            throw new Error('Aucune zone de drop trouvée');
+        }
+    
+        // Créer les événements de drag & drop
+        const dataTransfer = new DataTransfer();
+        dataTransfer.items.add(file);
+    
+        // Simuler la séquence complète de drag & drop
+        const events = [
+            new DragEvent('dragenter', {
+                bubbles: true,
+                cancelable: true,
+                dataTransfer: dataTransfer
+            }),
+            new DragEvent('dragover', {
+                bubbles: true,
+                cancelable: true,
+                dataTransfer: dataTransfer
+            }),
+            new DragEvent('drop', {
+                bubbles: true,
+                cancelable: true,
+                dataTransfer: dataTransfer
+            })
+        ];
+    
+        // Déclencher les événements à la suite (une micro-tâche entre chaque, sans délai fixe)
+        for (const event of events) {
+            dropZone.dispatchEvent(event);
+            await Promise.resolve();
+        }
+    
+        // Vérifier si un input file est disponible comme fallback
+        const fileInput = document.querySelector('input[type="file"]');
+        if (fileInput) {
+            console.log('Input file trouvé comme fallback');
+            // Simuler la sélection de fichier sur l'input (même DataTransfer que le drop)
+            fileInput.files = dataTransfer.files;
+        
+            // Déclencher l'événement change
+            const changeEvent = new Event('change', { bubbles: true });
+            fileInput.dispatchEvent(changeEvent);
+        }
+    
+        return {
+            success: true,
+            message: `Fichier ${fileName} uploadé avec succès`,
+            dropZoneFound: !!dropZone,
+            fileInputFound: !!fileInput
+        };
+    
+    } catch (error) {
+        return {
+            success: false,
+            error: error.message
+        };
+    }
+}
+"""
+
+# Indicateurs d'une pièce jointe affichée dans la zone de saisie (après drag & drop)
+_ATTACHMENT_SELECTOR_UNION = "[data-attachment], .file-preview, .upload-complete, [class*='attachment']"
+
+# Session sauvegardée localement (dernier recours après l'API et les variables d'environnement)
+_SESSION_STATE_FILE = Path("session_state.json")
+
+# Répertoire de données : container Docker (/app) ou environnement local (home)
+_DATA_DIR = (Path("/app") if Path("/app").exists() else Path.home()) / ".ai-interface-actions"
+
+# Profil navigateur du contexte persistant
+_USER_DATA_DIR = _DATA_DIR / "browser-data"
+
+# Sélecteurs gagnants persistés (même répertoire de données que le profil navigateur)
+_SELECTOR_CACHE_FILE = _DATA_DIR / "selectors.json"
+
+
+def _atomic_write_json(path: Path, data: Any, indent: Optional[int] = None) -> None:
+    """Écrit un JSON via un fichier temporaire renommé : un arrêt en cours d'écriture ne laisse jamais de fichier tronqué"""
+    # Nom temporaire unique : deux écritures simultanées ne partagent jamais le même fichier
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, prefix=path.name, suffix=".tmp", delete=False) as tmp_file:
+        tmp_file.write(json.dumps(data, indent=indent))
+    try:
+        os.replace(tmp_file.name, path)
+    except Exception:
+        os.unlink(tmp_file.name)
+        raise
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_user_data_dir() -> Path:
+    """Crée le répertoire du profil navigateur une seule fois par processus"""
+    _USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    return _USER_DATA_DIR
+
+# Nombre max de pages vierges gardées sur le contexte principal quand le pool est désactivé
+_IDLE_PAGE_POOL_SIZE = 4
+
+# Nombre max de pages de conversation gardées ouvertes (les moins récemment utilisées sont fermées)
+_ACTIVE_PAGE_LIMIT = 8
+
+# Attente max du champ de saisie après navigation (ms)
+_INPUT_READY_TIMEOUT_MS = 15000
+
+# Ressources inutiles à l'automatisation (on ne fait que saisir du texte et lire des réponses)
+_IMAGE_RESOURCE_TYPES = {"image", "font", "media"}
+_CSS_RESOURCE_TYPES = {"stylesheet"}
+# Domaines publicitaires / analytics bloqués quand avoid_ads est activé
+_AD_HOSTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "hotjar.com",
+    "facebook.net",
+    "intercom.io",
+)
 
 
 class BrowserAutomation:
@@ -23,9 +577,31 @@ class BrowserAutomation:
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.is_initialized = False
-        self.credentials_client = CredentialsAPIClient()
+        self.headless_mode: Optional[bool] = None  # mode d'affichage du navigateur lancé
+        self._init_lock: Optional[asyncio.Lock] = None
+        self.browser_is_shared = False  # True si connecté à un Chromium partagé via CDP
+        self._blocked_resource_types: set = set()  # types de ressources bloqués (mode headless)
+        self._block_ads = False
+        self.credentials_client = credentials_client  # client partagé (pool de connexions HTTP commun)
         # Pool de pages pour réutilisation
         self.active_pages: Dict[str, Page] = {}  # conversation_url -> page
+        self._pages_in_use: Dict[Page, int] = {}  # page de conversation -> nombre de requêtes qui l'utilisent
+        self._login_page: Optional[Page] = None  # page ouverte par open_login_page (seule surveillée au login)
+        # Pool de contextes pré-chauffés pour les nouvelles conversations (mode temporaire)
+        self._context_pool: Optional[asyncio.Queue] = None
+        self._context_options: Dict[str, Any] = {}
+        self._context_uses: Dict[BrowserContext, int] = {}  # contexte -> nombre d'utilisations
+        self._stale_contexts: set = set()  # contextes créés avec une session périmée, recyclés à leur retour
+        self._page_contexts: Dict[Page, BrowserContext] = {}  # page empruntée -> contexte du pool
+        # Pages ramenées sur l'accueil Manus.ai, conservées pour les prochaines nouvelles conversations
+        self._context_pages: Dict[BrowserContext, Page] = {}  # contexte du pool -> sa page réutilisable
+        self._idle_pages: List[Page] = []  # pages du contexte principal (sans pool)
+        # Derniers sélecteurs gagnants par origine (persistés sur disque entre redémarrages)
+        self._selector_cache: Dict[str, str] = {}  # netloc -> sélecteur du champ de saisie
+        self._response_selector_cache: Dict[str, str] = {}  # netloc -> sélecteur de la réponse IA
+        # Contenu de session_state.json, lu une seule fois puis tenu à jour à chaque sauvegarde
+        self._local_session_state: Optional[Dict[str, Any]] = None
+        self._local_session_loaded = False
         
     async def initialize(self, headless_override: bool = None) -> None:
         """
@@ -36,10 +612,12 @@ class BrowserAutomation:
         """
         try:
             logger.info("Initialisation du navigateur Playwright")
-            self.playwright = await async_playwright().start()
+            self._load_selector_cache()
+            self.playwright = await get_shared_playwright()
             
             # Déterminer le mode headless
             use_headless = headless_override if headless_override is not None else settings.headless
+            self.headless_mode = use_headless
             logger.info(f"Mode navigateur: {'headless' if use_headless else 'visible'}")
             
             # Configuration commune
@@ -50,13 +628,7 @@ class BrowserAutomation:
                 "args": [
                     "--no-sandbox",
                     "--disable-dev-shm-usage",
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-web-security",
-                    "--disable-features=VizDisplayCompositor",
-                    "--disable-extensions-except",
-                    "--disable-plugins",
-                    "--disable-javascript-harmony-shipping",
-                    "--max_old_space_size=4096"
+                    "--disable-blink-features=AutomationControlled"
                 ]
             }
             
@@ -75,14 +647,7 @@ class BrowserAutomation:
             # Utiliser contexte persistant (profil utilisateur) ou session temporaire
             if settings.use_persistent_context:
                 # Utiliser le répertoire de données utilisateur pour persistance RÉELLE
-                # Détecter si on est dans un container Docker ou en local
-                if Path("/app").exists():
-                    # Container Docker
-                    user_data_dir = Path("/app") / ".ai-interface-actions" / "browser-data"
-                else:
-                    # Environnement local
-                    user_data_dir = Path.home() / ".ai-interface-actions" / "browser-data"
-                user_data_dir.mkdir(parents=True, exist_ok=True)
+                user_data_dir = _ensure_user_data_dir()
                 
                 # IMPORTANT: launch_persistent_context utilise le profil utilisateur
                 persistent_options = {
@@ -102,19 +667,27 @@ class BrowserAutomation:
                 self.browser = None
                 logger.info("Contexte persistant créé avec profil utilisateur (PAS navigation privée)")
             else:
-                # Mode session temporaire (navigation privée avec sauvegarde)
-                launch_options = {
-                    "headless": use_headless,
-                    "args": context_options["args"]
-                }
-                
-                # Utiliser Chromium de Nix si disponible
-                chromium_path = os.environ.get("PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH")
-                if chromium_path and chromium_path != "0":
-                    launch_options["executable_path"] = chromium_path
-                    logger.info(f"Utilisation de Chromium personnalisé: {chromium_path}")
-                
-                self.browser = await self.playwright.chromium.launch(**launch_options)
+                if settings.manus_cdp_endpoint:
+                    # Navigateur partagé : un seul Chromium lancé avec --remote-debugging-port,
+                    # chaque instance n'y ouvre que ses propres contextes
+                    self.browser = await self.playwright.chromium.connect_over_cdp(settings.manus_cdp_endpoint)
+                    self.browser_is_shared = True
+                    logger.info("Connecté au navigateur partagé via CDP", endpoint=settings.manus_cdp_endpoint)
+                else:
+                    # Mode session temporaire (navigation privée avec sauvegarde)
+                    launch_options = {
+                        "headless": use_headless,
+                        "args": context_options["args"]
+                    }
+                    
+                    # Utiliser Chromium de Nix si disponible
+                    chromium_path = os.environ.get("PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH")
+                    if chromium_path and chromium_path != "0":
+                        launch_options["executable_path"] = chromium_path
+                        logger.info(f"Utilisation de Chromium personnalisé: {chromium_path}")
+                    
+                    self.browser = await self.playwright.chromium.launch(**launch_options)
+                    self.browser_is_shared = False
                 
                 # Préparer les options pour new_context
                 new_context_options = {
@@ -129,10 +702,24 @@ class BrowserAutomation:
                     new_context_options["viewport"] = context_options["viewport"]
                 
                 self.context = await self.browser.new_context(**new_context_options)
+                self._context_options = new_context_options
                 logger.info("Contexte temporaire créé (navigation privée avec sauvegarde)")
             
             # Configuration des timeouts
-            self.context.set_default_timeout(settings.page_timeout)
+            self.context.set_default_timeout(_PAGE_TIMEOUT_MS)
+            
+            # Bloquer images/CSS/pubs en headless (le mode visible sert au login manuel)
+            self._blocked_resource_types = set()
+            self._block_ads = use_headless and settings.avoid_ads
+            if use_headless:
+                if settings.avoid_images:
+                    self._blocked_resource_types |= _IMAGE_RESOURCE_TYPES
+                if settings.avoid_css:
+                    self._blocked_resource_types |= _CSS_RESOURCE_TYPES
+            await self._install_resource_blocking(self.context)
+            
+            # Pré-chauffer le pool de contextes pour les nouvelles conversations
+            await self._warm_context_pool()
             
             # Login manuel uniquement - pas de login automatique
             
@@ -155,12 +742,29 @@ class BrowserAutomation:
                     logger.warning("Erreur lors de la fermeture d'une page", url=conversation_url, error=str(e))
             
             self.active_pages.clear()
+            self._pages_in_use.clear()
+            self._login_page = None
+            
+            # Fermer les contextes du pool
+            if self._context_pool is not None:
+                while not self._context_pool.empty():
+                    pooled_context = self._context_pool.get_nowait()
+                    try:
+                        await pooled_context.close()
+                    except Exception as e:
+                        logger.warning("Erreur lors de la fermeture d'un contexte du pool", error=str(e))
+                self._context_pool = None
+            self._context_uses.clear()
+            self._stale_contexts.clear()
+            self._page_contexts.clear()
+            self._context_pages.clear()
+            self._idle_pages.clear()
             
             if self.context:
                 # Sauvegarder seulement si on utilise le mode temporaire (avec browser)
                 if self.browser and not settings.use_persistent_context:
                     try:
-                        await self.context.storage_state(path="session_state.json")
+                        await self._save_session_state()
                         logger.info("État de session sauvegardé")
                     except Exception as e:
                         logger.warning("Impossible de sauvegarder la session", error=str(e))
@@ -169,11 +773,15 @@ class BrowserAutomation:
                 logger.info("Contexte fermé")
             
             if self.browser:
-                await self.browser.close()
-                logger.info("Navigateur fermé")
+                if self.browser_is_shared:
+                    # Ne jamais fermer le navigateur partagé : playwright.stop() coupe la connexion CDP
+                    logger.info("Navigateur partagé conservé, contextes fermés")
+                else:
+                    await self.browser.close()
+                    logger.info("Navigateur fermé")
             
-            if self.playwright:
-                await self.playwright.stop()
+            # Le driver Playwright est partagé : il est conservé pour les réinitialisations
+            self.playwright = None
             
             self.is_initialized = False
             logger.info("Ressources du navigateur nettoyées")
@@ -181,6 +789,142 @@ class BrowserAutomation:
         except Exception as e:
             logger.error("Erreur lors du nettoyage", error=str(e))
     
+    async def _create_pooled_context(self) -> BrowserContext:
+        """Crée un contexte prêt à l'emploi pour le pool"""
+        context = await self.browser.new_context(**self._context_options)
+        context.set_default_timeout(_PAGE_TIMEOUT_MS)
+        await self._install_resource_blocking(context)
+        self._context_uses[context] = 0
+        return context
+    
+    async def _install_resource_blocking(self, context: BrowserContext) -> None:
+        """Installe le filtrage des ressources sur un contexte (rien à faire si aucun blocage actif)"""
+        if self._blocked_resource_types or self._block_ads:
+            await context.route("**/*", self._route_resource)
+    
+    async def _route_resource(self, route) -> None:
+        """Interrompt les requêtes vers des ressources bloquées, laisse passer les autres"""
+        request = route.request
+        if request.resource_type in self._blocked_resource_types or (
+            self._block_ads and (urlparse(request.url).hostname or "").endswith(_AD_HOSTS)
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _warm_context_pool(self) -> None:
+        """Pré-chauffe le pool de contextes (indisponible en mode contexte persistant)"""
+        if not self.browser or settings.context_pool_size <= 0:
+            self._context_pool = None
+            return
+        
+        self._context_pool = asyncio.Queue(maxsize=settings.context_pool_size)
+        # Contextes créés en parallèle : le démarrage ne coûte qu'une création de contexte
+        contexts = await asyncio.gather(*(self._create_pooled_context() for _ in range(settings.context_pool_size)))
+        for context in contexts:
+            self._context_pool.put_nowait(context)
+        logger.info("Pool de contextes pré-chauffé",
+                   pool_size=settings.context_pool_size,
+                   max_uses=settings.max_uses_per_context)
+    
+    async def _acquire_page(self) -> Page:
+        """
+        Ouvre une page pour une nouvelle conversation dans un contexte emprunté au pool
+        
+        Returns:
+            Page Playwright à rendre via _release_page
+        """
+        if self._context_pool is None:
+            while self._idle_pages:
+                page = self._idle_pages.pop()
+                if not page.is_closed():
+                    return page
+            return await self.context.new_page()
+        
+        context = await self._context_pool.get()
+        try:
+            page = self._context_pages.pop(context, None)
+            if page is None or page.is_closed():
+                page = await context.new_page()
+        except Exception:
+            await self._release_context(context)
+            raise
+        
+        self._page_contexts[page] = context
+        logger.info("📝 Contexte emprunté au pool", available=self._context_pool.qsize())
+        return page
+    
+    async def _release_page(self, page: Page) -> None:
+        """
+        Rend une page de nouvelle conversation : elle est ramenée sur l'accueil Manus.ai et gardée
+        pour la prochaine demande plutôt que fermée (qui évite alors la navigation, voir
+        _is_on_ready_home_page), puis son contexte retourne au pool
+        """
+        context = self._page_contexts.pop(page, None)
+        try:
+            if not page.is_closed():
+                try:
+                    # Attente limitée au début de la navigation : le chargement se poursuit après le rendu
+                    await page.goto(_MANUS_BASE_URL, wait_until="commit")
+                    if context is not None:
+                        self._context_pages[context] = page
+                    elif len(self._idle_pages) < _IDLE_PAGE_POOL_SIZE:
+                        self._idle_pages.append(page)
+                    else:
+                        await page.close()
+                except Exception as e:
+                    logger.warning("Page non réutilisable, fermeture", error=str(e))
+                    await page.close()
+        finally:
+            if context is not None:
+                await self._release_context(context)
+    
+    async def _release_context(self, context: BrowserContext) -> None:
+        """Rend un contexte au pool, en le recyclant après max_uses_per_context utilisations"""
+        if self._context_pool is None:
+            # Le pool a été fermé pendant l'emprunt
+            self._context_pages.pop(context, None)
+            self._stale_contexts.discard(context)
+            try:
+                await context.close()
+            except Exception:
+                pass
+            return
+        
+        uses = self._context_uses.get(context, 0) + 1
+        if uses < settings.max_uses_per_context and context not in self._stale_contexts:
+            self._context_uses[context] = uses
+            self._context_pool.put_nowait(context)
+            return
+        
+        try:
+            fresh_context = await self._create_pooled_context()
+        except Exception as e:
+            logger.warning("Recyclage du contexte impossible, contexte conservé", error=str(e))
+            self._context_uses[context] = 0
+            self._context_pool.put_nowait(context)
+            return
+        
+        self._context_uses.pop(context, None)
+        self._stale_contexts.discard(context)
+        self._context_pages.pop(context, None)  # fermée avec son contexte
+        self._context_pool.put_nowait(fresh_context)
+        logger.info("♻️ Contexte du pool recyclé", uses=uses)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning("Erreur lors de la fermeture du contexte recyclé", error=str(e))
+    
+    async def _refresh_context_pool(self) -> None:
+        """Remplace les contextes du pool par des contextes créés avec la session à jour"""
+        # Les contextes empruntés seront recyclés à leur retour (voir _release_context)
+        self._stale_contexts.update(self._context_uses)
+        idle_contexts = []
+        while not self._context_pool.empty():
+            idle_contexts.append(self._context_pool.get_nowait())
+        await asyncio.gather(*(self._release_context(context) for context in idle_contexts))
+        logger.info("Pool de contextes rafraîchi avec la nouvelle session", refreshed=len(idle_contexts))
+    
     async def _get_or_create_page(self, conversation_url: str = "") -> Page:
         """
         Récupère une page existante ou en crée une nouvelle
@@ -214,6 +958,7 @@ class BrowserAutomation:
                 page = self.active_pages[conversation_url]
                 if not page.is_closed():
                     logger.info("✅ REUTILISATION page existante trouvée", url=conversation_url)
+                    await self._remember_active_page(conversation_url, page)
                     return page
                 else:
                     # Page fermée, la supprimer du pool
@@ -221,43 +966,92 @@ class BrowserAutomation:
                     logger.info("❌ Page fermée supprimée du pool", url=conversation_url)
             
             # Vérifier si une page existante pointe déjà vers cette conversation
+            target_id = self._extract_conversation_id(conversation_url)
             for existing_url, page in self.active_pages.items():
-                if not page.is_closed():
+                if target_id and not page.is_closed():
                     try:
-                        current_page_url = page.url
-                        # Extraire l'ID de conversation des deux URLs pour comparaison
-                        if self._extract_conversation_id(current_page_url) == self._extract_conversation_id(conversation_url):
+                        # Comparer les ID de conversation (un ID vide ne correspond à rien)
+                        if self._extract_conversation_id(page.url) == target_id:
                             logger.info("Page existante trouvée pour cette conversation", 
                                        existing_url=existing_url, 
                                        target_url=conversation_url)
                             # Mettre à jour la clé dans le pool
                             del self.active_pages[existing_url]
-                            self.active_pages[conversation_url] = page
+                            await self._remember_active_page(conversation_url, page)
                             return page
                     except Exception as e:
                         logger.warning("Erreur lors de la vérification de page existante", error=str(e))
         
-        # Pour les nouvelles conversations, essayer de réutiliser une page générique existante
-        if not conversation_url or not conversation_url.strip():
-            # Chercher une page générique existante (sans URL spécifique ou "nouvelle_conversation")
-            for existing_key, page in list(self.active_pages.items()):
-                if not page.is_closed() and (not existing_key or existing_key == "nouvelle_conversation" or existing_key == "diagnostic"):
-                    logger.info("✅ REUTILISATION page générique existante", key=existing_key)
-                    return page
+        # Pour les nouvelles conversations, emprunter un contexte au pool
+        if self._is_new_conversation(conversation_url):
+            return await self._acquire_page()
         
         # Créer une nouvelle page seulement si nécessaire
         logger.warning("🆕 CREATION NOUVELLE PAGE", 
-                      conversation_url=conversation_url or "nouvelle_conversation",
+                      conversation_url=conversation_url,
                       reason="Aucune page existante trouvée")
         page = await self.context.new_page()
         
-        # L'ajouter au pool avec une clé appropriée
-        pool_key = conversation_url if conversation_url and conversation_url.strip() else "nouvelle_conversation"
-        self.active_pages[pool_key] = page
-        logger.info("📝 Page ajoutée au pool", url=pool_key, pool_size=len(self.active_pages))
+        # L'ajouter au pool
+        await self._remember_active_page(conversation_url, page)
+        logger.info("📝 Page ajoutée au pool", url=conversation_url, pool_size=len(self.active_pages))
         
         return page
     
+    async def _remember_active_page(self, conversation_url: str, page: Page) -> None:
+        """
+        Place la page en tête d'usage (ordre d'insertion du dict = ordre LRU) et la marque comme
+        utilisée par la requête en cours (à rendre via _checkin_page)
+        """
+        self.active_pages.pop(conversation_url, None)
+        self.active_pages[conversation_url] = page
+        self._pages_in_use[page] = self._pages_in_use.get(page, 0) + 1
+        await self._evict_idle_pages()
+    
+    async def _checkin_page(self, page: Page) -> None:
+        """Signale qu'une requête a fini d'utiliser une page de conversation"""
+        uses = self._pages_in_use.pop(page, 0) - 1
+        if uses > 0:
+            self._pages_in_use[page] = uses
+        await self._evict_idle_pages()
+    
+    async def _evict_idle_pages(self) -> None:
+        """
+        Ferme les pages les moins récemment utilisées au-delà de _ACTIVE_PAGE_LIMIT, en sautant
+        celles encore utilisées par une requête (fermées plus tard, quand elles sont rendues)
+        """
+        excess = len(self.active_pages) - _ACTIVE_PAGE_LIMIT
+        if excess <= 0:
+            return
+        idle_urls = [url for url, page in self.active_pages.items() if page not in self._pages_in_use]
+        for oldest_url in idle_urls[:excess]:
+            oldest_page = self.active_pages.pop(oldest_url)
+            logger.info("Page de conversation la moins récente fermée", url=oldest_url)
+            try:
+                if not oldest_page.is_closed():
+                    await oldest_page.close()
+            except Exception as e:
+                logger.warning("Erreur lors de la fermeture d'une page", url=oldest_url, error=str(e))
+    
+    async def _is_on_ready_home_page(self, page: Page) -> bool:
+        """
+        Indique si la page est déjà sur l'accueil Manus.ai avec le champ de saisie visible
+        (une nouvelle conversation peut alors démarrer sans recharger la page)
+        """
+        if not page.url.startswith(_MANUS_BASE_URL) or self._extract_conversation_id(page.url):
+            return False
+        try:
+            return await page.locator(_SPECIFIC_SELECTOR_UNION).first.is_visible()
+        except Exception:
+            return False
+    
+    def _is_new_conversation(self, conversation_url: Optional[str]) -> bool:
+        """
+        Indique si la demande porte sur une nouvelle conversation (URL vide ou blanche) : sa page
+        vient alors du pool et doit être rendue via _release_page, pas _checkin_page
+        """
+        return not conversation_url or not conversation_url.strip()
+    
     def _extract_conversation_id(self, url: str) -> str:
         """
         Extrait l'ID de conversation d'une URL Manus.im
@@ -269,9 +1063,7 @@ class BrowserAutomation:
             ID de conversation (ex: XBiN8PvUegJQRHuPMCnvPo)
         """
         try:
-            if "/app/" in url:
-                return url.split("/app/")[-1].split("?")[0].split("#")[0]
-            return ""
+            return _conversation_id_from_url(url)
         except Exception:
             return ""
     
@@ -310,8 +1102,6 @@ class BrowserAutomation:
         try:
             # Option 1 : API de credentials externe (PRIORITÉ)
             try:
-                from ai_interface_actions.credentials_client import credentials_client
-                
                 if credentials_client.is_configured():
                     logger.info("Tentative de récupération des credentials via API externe")
                     
@@ -406,11 +1196,13 @@ class BrowserAutomation:
                 logger.warning("❌ Aucune variable d'environnement MANUS_* trouvée")
 
             # Option 3 : Fichier de session local
-            session_file = Path("session_state.json")
-            if session_file.exists():
+            if not self._local_session_loaded:
+                if _SESSION_STATE_FILE.exists():
+                    self._local_session_state = json.loads(_SESSION_STATE_FILE.read_text())
+                self._local_session_loaded = True
+            if self._local_session_state:
                 logger.info("Chargement de la session depuis le fichier local")
-                with open(session_file, 'r') as f:
-                    return json.load(f)
+                return self._local_session_state
 
             logger.warning("❌ Aucune session trouvée (API, variables d'env, ou fichier local)")
             return None
@@ -420,27 +1212,34 @@ class BrowserAutomation:
             return None
 
     async def ensure_initialized(self, headless_override: bool = None) -> None:
-        """S'assure que le navigateur est initialisé"""
-        if not self.is_initialized:
-            await self.initialize(headless_override)
+        """S'assure que le navigateur est initialisé (une seule initialisation même en concurrence)"""
+        if self.is_initialized:
+            return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if not self.is_initialized:
+                await self.initialize(headless_override)
     
     async def open_login_page(self) -> str:
         """
         Ouvre une page de connexion Manus.ai pour connexion manuelle
         Retourne l'URL de la page ouverte
         """
-        # Réinitialiser avec mode visible pour le setup
-        if self.is_initialized:
-            await self.cleanup()
-        
         # Utiliser la configuration headless_setup ou forcer visible
         headless_mode = settings.headless_setup
         
+        # Relancer le navigateur seulement si son mode d'affichage doit changer
+        # (un navigateur partagé via CDP n'est jamais relancé)
+        if self.is_initialized and self.headless_mode != headless_mode and not self.browser_is_shared:
+            await self.cleanup()
+        
         await self.ensure_initialized(headless_override=headless_mode)
         
-        # Ouvrir la page de connexion
+        # Ouvrir la page de connexion (les autres pages du contexte ne comptent pas pour la détection du login)
         page = await self.context.new_page()
-        await page.goto(settings.manus_base_url)
+        self._login_page = page
+        await page.goto(_MANUS_BASE_URL)
         
         mode_text = "invisible (headless)" if headless_mode else "visible"
         logger.info(f"🌐 Page de connexion Manus.ai ouverte en mode {mode_text}")
@@ -479,13 +1278,14 @@ class BrowserAutomation:
                 current_url = page.url
                 if self._extract_conversation_id(current_url) != self._extract_conversation_id(conversation_url):
                     logger.info("Navigation vers conversation existante", url=conversation_url)
-                    await page.goto(conversation_url, wait_until="networkidle")
+                    await page.goto(conversation_url, wait_until="domcontentloaded")
                 else:
                     logger.info("Page déjà sur la bonne conversation", url=current_url)
                 return conversation_url  # URL déjà connue
             else:
                 logger.info("Navigation vers Manus.ai pour nouvelle conversation")
-                await page.goto(settings.manus_base_url, wait_until="networkidle")
+                # La vérification de connexion qui suit attend les éléments de l'interface
+                await page.goto(_MANUS_BASE_URL, wait_until="domcontentloaded")
             
             # Vérifier le statut de connexion avec bypass Railway
             login_status = await self._check_login_status(page)
@@ -518,25 +1318,23 @@ class BrowserAutomation:
                     raise Exception("Impossible de trouver le champ de saisie malgré les tentatives de récupération")
             
             # Saisie et envoi du message
-            await message_input.fill(message)
+            await message_input.fill(message, no_wait_after=True)
             await self._send_message(page)
             
             # Gérer le popup "Wide Research" s'il apparaît
             await self._handle_wide_research_popup(page)
             
-            # Attendre que l'URL change (nouvelle conversation créée)
-            start_time = asyncio.get_event_loop().time()
+            # Attendre que l'URL change (nouvelle conversation créée) : le navigateur signale la navigation
             initial_url = page.url
-            
-            while asyncio.get_event_loop().time() - start_time < max_wait_seconds:
-                current_url = page.url
-                
-                # Si l'URL a changé et contient un ID de conversation
-                if current_url != initial_url and "/app/" in current_url:
-                    logger.info("URL de conversation détectée", url=current_url)
-                    return current_url
-                
-                await asyncio.sleep(0.5)
+            try:
+                await page.wait_for_url(
+                    lambda url: url != initial_url and "/app/" in url,
+                    timeout=max_wait_seconds * 1000
+                )
+                logger.info("URL de conversation détectée", url=page.url)
+                return page.url
+            except TimeoutError:
+                pass
             
             # Fallback : vérifier si on a au moins une URL Manus.ai valide
             final_url = page.url
@@ -547,7 +1345,7 @@ class BrowserAutomation:
                 logger.error("URL finale invalide après timeout", url=final_url)
                 # Essayer de naviguer vers Manus.ai et récupérer une URL valide
                 try:
-                    await page.goto(settings.manus_base_url, wait_until="networkidle")
+                    await page.goto(_MANUS_BASE_URL, wait_until="domcontentloaded")
                     corrected_url = page.url
                     logger.info("URL corrigée vers Manus.ai", url=corrected_url)
                     return corrected_url
@@ -563,10 +1361,25 @@ class BrowserAutomation:
             
         finally:
             # Ne fermer la page que si c'est une nouvelle page temporaire (sans conversation_url)
-            if page and not conversation_url:
-                await page.close()
-                logger.info("Page temporaire fermée")
-            # Pour les conversations existantes, garder la page ouverte dans le pool
+            if page and self._is_new_conversation(conversation_url):
+                await self._release_page(page)
+                logger.info("Page temporaire rendue au pool")
+            elif page:
+                # Pour les conversations existantes, garder la page ouverte dans le pool
+                await self._checkin_page(page)
+    
+    async def _save_session_state(self) -> None:
+        """Sauvegarde l'état de session de façon atomique (fichier temporaire puis renommage)"""
+        state = await self.context.storage_state()
+        # Sérialisation et écriture hors de la boucle d'événements
+        await asyncio.to_thread(_atomic_write_json, _SESSION_STATE_FILE, state)
+        self._local_session_state = state
+        self._local_session_loaded = True
+        # Les nouvelles conversations tournent dans les contextes du pool : leur donner la session à jour
+        if self._context_options:
+            self._context_options["storage_state"] = state
+        if self._context_pool is not None:
+            await self._refresh_context_pool()
     
     async def wait_for_login_and_save_session(self, timeout_minutes: int = 10) -> bool:
         """
@@ -578,40 +1391,61 @@ class BrowserAutomation:
             
             logger.info(f"⏳ Attente de votre connexion (timeout: {timeout_minutes} minutes)")
             
-            # Attendre que l'utilisateur navigue ou se connecte
-            # On vérifie périodiquement si l'utilisateur est connecté
-            import time
-            start_time = time.time()
+            # Attendre que l'utilisateur se connecte sur la page de connexion (ou un popup qu'elle ouvre) :
+            # les pages de conversation déjà ouvertes sur /app/... satisferaient le test d'URL d'emblée
             timeout_seconds = timeout_minutes * 60
+            stop_waiting = asyncio.Event()  # connexion détectée ou plus aucune page surveillée ouverte
+            logged_in = False
+            
+            def is_logged_in_url(url: str) -> bool:
+                url = url.lower()
+                return "chat" in url or "dashboard" in url or "app" in url
+            
+            login_page = self._login_page
+            watched: List[Page] = [login_page] if login_page and not login_page.is_closed() else []
+            watchers: List[asyncio.Task] = []
             
-            while time.time() - start_time < timeout_seconds:
+            async def watch_page(page: Page) -> None:
+                nonlocal logged_in
                 try:
-                    # Vérifier s'il y a des pages ouvertes
-                    pages = self.context.pages
-                    if not pages:
-                        break
-                    
-                    # Vérifier si l'utilisateur semble connecté (pas sur page de login)
-                    for page in pages:
-                        try:
-                            url = page.url
-                            # Si l'URL a changé ou contient des indicateurs de connexion
-                            if "chat" in url.lower() or "dashboard" in url.lower() or "app" in url.lower():
-                                logger.info("✅ Connexion détectée ! Sauvegarde de la session...")
-                                await self.context.storage_state(path="session_state.json")
-                                logger.info("💾 Session sauvegardée avec succès")
-                                return True
-                        except:
-                            continue
-                    
-                    await asyncio.sleep(2)  # Vérifier toutes les 2 secondes
-                    
+                    await page.wait_for_url(is_logged_in_url, timeout=timeout_seconds * 1000)
+                    logged_in = True
+                    stop_waiting.set()
                 except Exception:
-                    continue
+                    # Page fermée : on n'abandonne que si plus aucune page surveillée n'est ouverte
+                    if all(watched_page.is_closed() for watched_page in watched):
+                        stop_waiting.set()
+            
+            def watch(page: Page) -> None:
+                if page not in watched:
+                    watched.append(page)
+                # Les popups ouverts par une page surveillée (ex: connexion Google) le sont aussi
+                page.on("popup", watch)
+                watchers.append(asyncio.create_task(watch_page(page)))
+            
+            for page in list(watched):
+                watch(page)
+            
+            if watchers:
+                try:
+                    await asyncio.wait_for(stop_waiting.wait(), timeout_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    for page in watched:
+                        page.remove_listener("popup", watch)
+                    for watcher in watchers:
+                        watcher.cancel()
+                
+                if logged_in:
+                    logger.info("✅ Connexion détectée ! Sauvegarde de la session...")
+                    await self._save_session_state()
+                    logger.info("💾 Session sauvegardée avec succès")
+                    return True
             
             # Timeout atteint, sauvegarder quand même
             logger.warning("⏰ Timeout atteint, sauvegarde de l'état actuel...")
-            await self.context.storage_state(path="session_state.json")
+            await self._save_session_state()
             logger.info("💾 Session sauvegardée")
             return True
             
@@ -651,56 +1485,39 @@ class BrowserAutomation:
                 current_url = page.url
                 if self._extract_conversation_id(current_url) != self._extract_conversation_id(conversation_url):
                     logger.info("Navigation vers conversation existante", url=conversation_url)
-                    await page.goto(conversation_url, wait_until="networkidle")
+                    await page.goto(conversation_url, wait_until="domcontentloaded")
+                    await self._wait_for_message_input_ready(page)
                 else:
                     logger.info("Page déjà sur la bonne conversation", url=current_url)
+            elif await self._is_on_ready_home_page(page):
+                logger.info("Page déjà sur l'accueil Manus.ai, navigation évitée", url=page.url)
             else:
                 logger.info("Navigation vers Manus.ai (nouvelle conversation)")
-                await page.goto(settings.manus_base_url, wait_until="networkidle")
+                await page.goto(_MANUS_BASE_URL, wait_until="domcontentloaded")
+                await self._wait_for_message_input_ready(page)
             
             # Pas de vérification de connexion - l'utilisateur se connecte manuellement
             
-            # Diagnostic de l'état de la page avant recherche
+            # Diagnostic de l'état de la page et recherche du champ de saisie (avec récupération) en parallèle
             current_url = page.url
-            page_title = await page.title()
+            logger.info("Recherche du champ de saisie avec système de récupération")
+            page_title, message_input = await asyncio.gather(
+                page.title(),
+                self._find_message_input_with_recovery(page, conversation_url)
+            )
             logger.info("🔍 Diagnostic de la page avant recherche de zone de saisie", 
                        url=current_url, 
                        title=page_title)
             
-            # Recherche du champ de saisie de message avec récupération automatique
-            logger.info("Recherche du champ de saisie avec système de récupération")
-            message_input = await self._find_message_input_with_recovery(page, conversation_url)
-            
             if not message_input:
                 # Diagnostic détaillé en cas d'échec
                 logger.error("❌ DIAGNOSTIC DÉTAILLÉ - Zone de saisie non trouvée")
                 logger.error("URL actuelle", url=page.url)
-                logger.error("Titre de page", title=await page.title())
                 
-                # Capturer le HTML pour diagnostic
+                # Capturer URL, titre et champs de la page pour diagnostic (un seul appel CDP)
                 try:
-                    html_snippet = await page.evaluate("""
-                        () => {
-                            // Chercher tous les textarea et input
-                            const textareas = Array.from(document.querySelectorAll('textarea'));
-                            const inputs = Array.from(document.querySelectorAll('input'));
-                            
-                            return {
-                                textareas: textareas.map(t => ({
-                                    placeholder: t.placeholder,
-                                    visible: t.offsetParent !== null,
-                                    disabled: t.disabled
-                                })),
-                                inputs: inputs.map(i => ({
-                                    type: i.type,
-                                    placeholder: i.placeholder,
-                                    visible: i.offsetParent !== null,
-                                    disabled: i.disabled
-                                })),
-                                bodyText: document.body.innerText.substring(0, 500)
-                            };
-                        }
-                    """)
+                    html_snippet = await page.evaluate(_INPUT_DIAGNOSTIC_JS)
+                    logger.error("Titre de page", title=html_snippet.pop("title"), url=html_snippet.pop("url"))
                     logger.error("Éléments détectés sur la page", elements=html_snippet)
                 except Exception as diag_e:
                     logger.error("Impossible de capturer le diagnostic HTML", error=str(diag_e))
@@ -709,19 +1526,21 @@ class BrowserAutomation:
             
             # Saisie du message
             logger.info("Saisie du message")
-            await message_input.fill(message)
+            await message_input.fill(message, no_wait_after=True)
             
             # Envoi du message
             await self._send_message(page)
             
-            # Gérer le popup "Wide Research" s'il apparaît
-            await self._handle_wide_research_popup(page)
-            
-            # Attendre la réponse si demandé
+            # Gérer le popup "Wide Research" pendant l'attente de la réponse (si demandée)
             ai_response = None
             if wait_for_response:
                 logger.info("Attente de la réponse de l'IA", timeout=timeout_seconds)
-                ai_response = await self._wait_for_ai_response(page, timeout_seconds)
+                _, ai_response = await asyncio.gather(
+                    self._handle_wide_research_popup(page),
+                    self._wait_for_ai_response(page, timeout_seconds)
+                )
+            else:
+                await self._handle_wide_research_popup(page)
             
             # Récupérer l'URL finale de la conversation
             final_url = page.url
@@ -731,7 +1550,7 @@ class BrowserAutomation:
                 logger.warning("URL finale invalide détectée, correction...", invalid_url=final_url)
                 try:
                     # Essayer de naviguer vers Manus.ai pour corriger
-                    await page.goto(settings.manus_base_url, wait_until="networkidle")
+                    await page.goto(_MANUS_BASE_URL, wait_until="domcontentloaded")
                     corrected_url = page.url
                     logger.info("URL corrigée", corrected_url=corrected_url)
                     final_url = corrected_url
@@ -768,58 +1587,47 @@ class BrowserAutomation:
             
         finally:
             # Ne fermer la page que si c'est une nouvelle page temporaire (sans conversation_url)
-            if page and not conversation_url:
-                await page.close()
-                logger.info("Page temporaire fermée")
-            # Pour les conversations existantes, garder la page ouverte dans le pool
+            if page and self._is_new_conversation(conversation_url):
+                await self._release_page(page)
+                logger.info("Page temporaire rendue au pool")
+            elif page:
+                # Pour les conversations existantes, garder la page ouverte dans le pool
+                await self._checkin_page(page)
     
     async def _check_login_status(self, page: Page) -> bool:
         """Vérifie si l'utilisateur est connecté"""
         try:
-            # Attendre que la page soit chargée
-            await page.wait_for_timeout(3000)
-            
-            # Vérifier d'abord la présence d'indicateurs de NON-connexion
-            login_indicators = [
-                "input[type='email']",
-                "input[name='email']",
-                "button:has-text('Sign in')",
-                "button:has-text('Login')",
-                "button:has-text('Se connecter')"
-            ]
-            
-            for indicator in login_indicators:
-                if await page.locator(indicator).count() > 0:
-                    logger.warning("Utilisateur non connecté - connexion manuelle requise")
-                    return False
+            # Course : attendre le formulaire de login ou le champ de saisie, le premier qui apparaît
+            try:
+                await page.wait_for_selector(_LOGIN_STATUS_UNION, state="attached", timeout=5000)
+            except TimeoutError:
+                pass
             
-            # Vérifier POSITIVEMENT la présence d'éléments de l'interface connectée
-            connected_indicators = [
-                "textarea[placeholder*='Attribuez une tâche']",  # Sélecteur spécifique Manus.ai
-                "textarea[placeholder*='posez une question']",   # Sélecteur spécifique Manus.ai
-                "textarea[placeholder*='message']",
-                "input[placeholder*='message']",
-                "textarea[placeholder*='Message']",
-                "input[placeholder*='Message']",
-                ".chat-input",
-                "[data-testid='chat-input']",
-                "button[data-testid='new-chat']",
-                ".new-chat",
-                ".sidebar",
-                "[data-testid='sidebar']",
-                ".user-menu",
-                "[data-testid='user-menu']",
-                "nav"
-            ]
+            # Les familles d'indicateurs sont comptées en parallèle (un count par union)
+            login_count, input_count, connected_count = await asyncio.gather(
+                page.locator(_LOGIN_INDICATOR_UNION).count(),
+                page.locator(_CONNECTED_INPUT_UNION).count(),
+                page.locator(_CONNECTED_INDICATOR_UNION).count()
+            )
             
-            # Attendre qu'au moins un élément de l'interface soit présent
-            for indicator in connected_indicators:
+            # Seulement des éléments génériques (nav, sidebar...) : laisser au formulaire de login
+            # le temps d'apparaître avant de conclure
+            if not login_count and not input_count and connected_count:
                 try:
-                    await page.wait_for_selector(indicator, timeout=5000)
-                    logger.info(f"Session utilisateur active - élément trouvé: {indicator}")
-                    return True
-                except:
-                    continue
+                    await page.wait_for_selector(_LOGIN_INDICATOR_UNION, state="attached", timeout=_LOGIN_FORM_GRACE_MS)
+                    login_count = 1
+                except TimeoutError:
+                    pass
+            
+            # Les indicateurs de NON-connexion restent prioritaires
+            if login_count > 0:
+                logger.warning("Utilisateur non connecté - connexion manuelle requise")
+                return False
+            
+            # Vérifier POSITIVEMENT la présence d'éléments de l'interface connectée
+            if connected_count > 0:
+                logger.info("Session utilisateur active - élément de l'interface connectée trouvé")
+                return True
             
             # Si aucun élément positif trouvé, vérifier l'URL
             current_url = page.url
@@ -827,15 +1635,6 @@ class BrowserAutomation:
                 logger.warning("URL de login détectée, utilisateur non connecté")
                 return False
             
-            # Dernière chance : attendre plus longtemps pour le chargement dynamique
-            logger.info("Attente supplémentaire pour le chargement des éléments...")
-            await page.wait_for_timeout(5000)
-            
-            for indicator in connected_indicators:
-                if await page.locator(indicator).count() > 0:
-                    logger.info(f"Session utilisateur active après attente - élément trouvé: {indicator}")
-                    return True
-            
             logger.warning("Aucun élément de l'interface connectée trouvé - statut de connexion incertain")
             return False
                     
@@ -843,8 +1642,49 @@ class BrowserAutomation:
             logger.warning("Impossible de vérifier le statut de connexion", error=str(e))
             return False
     
-    async def _find_message_input(self, page: Page) -> Optional[Any]:
-        """Trouve le champ de saisie de message - intelligent et adaptatif selon le contexte"""
+    async def _wait_for_message_input_ready(self, page: Page) -> None:
+        """Attend l'apparition du champ de saisie après une navigation (au lieu de networkidle)"""
+        try:
+            await page.wait_for_selector(_SPECIFIC_SELECTOR_UNION, state="visible", timeout=_INPUT_READY_TIMEOUT_MS)
+        except TimeoutError:
+            # La recherche complète de _find_message_input prend le relais
+            logger.warning("Champ de saisie non visible après navigation", url=page.url)
+    
+    def _load_selector_cache(self) -> None:
+        """Recharge les sélecteurs gagnants mémorisés lors des exécutions précédentes"""
+        try:
+            if _SELECTOR_CACHE_FILE.exists():
+                data = json.loads(_SELECTOR_CACHE_FILE.read_text())
+                self._selector_cache.update(data.get("input", {}))
+                self._response_selector_cache.update(data.get("response", {}))
+                logger.info("Sélecteurs mémorisés rechargés", path=str(_SELECTOR_CACHE_FILE))
+        except Exception as e:
+            logger.warning("Impossible de relire les sélecteurs mémorisés", error=str(e))
+    
+    async def _remember_selector(self, cache: Dict[str, str], key: str, selector: str) -> None:
+        """Mémorise un sélecteur gagnant et persiste le cache s'il a changé"""
+        if cache.get(key) == selector:
+            return
+        cache[key] = selector
+        # Copies figées ici : les caches peuvent changer pendant l'écriture hors de la boucle
+        data = {
+            "input": dict(self._selector_cache),
+            "response": dict(self._response_selector_cache),
+        }
+        try:
+            _SELECTOR_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(_atomic_write_json, _SELECTOR_CACHE_FILE, data, 2)
+        except Exception as e:
+            logger.warning("Impossible de persister les sélecteurs gagnants", error=str(e))
+    
+    async def _find_message_input(self, page: Page, fast: bool = False) -> Optional[Any]:
+        """
+        Trouve le champ de saisie de message - intelligent et adaptatif selon le contexte
+        
+        Args:
+            page: Page Playwright
+            fast: Ne tenter que le cache et l'union des sélecteurs spécifiques (1s max), sans scan complet
+        """
         current_url = page.url
         is_conversation_page = "/app/" in current_url
         
@@ -852,134 +1692,95 @@ class BrowserAutomation:
                    url=current_url, 
                    context="conversation" if is_conversation_page else "nouvelle")
         
-        # Sélecteurs ULTRA-PERMISSIFS - priorité aux plus spécifiques
-        # Tous les placeholders connus de Manus.ai (français et anglais)
-        specific_selectors = [
-            # Français - tous les variants possibles
-            "textarea[placeholder='Attribuez une tâche ou posez une question']",
-            "textarea[placeholder*='Attribuez une tâche ou posez une question']",
-            "textarea[placeholder*='Attribuez une tâche']",
-            "textarea[placeholder*='posez une question']", 
-            "textarea[placeholder*='Attribuez']",
-            "textarea[placeholder*='tâche']",
-            "textarea[placeholder*='question']",
-            
-            # Anglais - tous les variants possibles
-            "textarea[placeholder='Assign a task or ask anything']",
-            "textarea[placeholder*='Assign a task or ask anything']",
-            "textarea[placeholder*='Assign a task']",
-            "textarea[placeholder*='ask anything']",
-            "textarea[placeholder*='Assign']",
-            "textarea[placeholder*='task']",
-            "textarea[placeholder*='anything']",
-            
-            # Messages dans conversations
-            "textarea[placeholder*='Send message to Manus']",
-            "textarea[placeholder*='Send message']",
-            "textarea[placeholder*='message to Manus']",
-            "textarea[placeholder*='Envoyer un message']",
-            "textarea[placeholder*='Écrivez votre message']",
-            
-            # Génériques message
-            "textarea[placeholder*='message']",
-            "textarea[placeholder*='Message']",
-            "textarea[placeholder*='Tapez']",
-            "textarea[placeholder*='Type']",
-            "textarea[placeholder*='Écrivez']",
-            "textarea[placeholder*='Write']",
-        ]
-        
-        # Sélecteurs génériques TRÈS permissifs (fallback ultime)
-        fallback_selectors = [
-            # Inputs alternatifs
-            "input[placeholder*='message']",
-            "input[placeholder*='Message']", 
-            "input[placeholder*='tâche']",
-            "input[placeholder*='task']",
-            
-            # Contenteditable
-            "[contenteditable='true']",
-            "div[contenteditable='true']",
-            
-            # Textarea par structure
-            "textarea:not([readonly]):not([disabled])",
-            "textarea:not([style*='display: none']):not([style*='display:none'])",
-            "textarea[rows]",
-            "textarea.resize-none",
-            "textarea[class*='input']",
-            "textarea[class*='chat']",
-            "textarea[class*='message']",
-            
-            # Par classes CSS communes
-            ".message-input textarea",
-            ".chat-input textarea", 
-            ".input-container textarea",
-            ".text-input textarea",
-            
-            # Par IDs
-            "#message-input",
-            "#chat-input",
-            "#text-input",
-            
-            # Avec attributs spéciaux
-            "textarea[data-testid]",
-            "textarea[aria-label]",
-            "div[data-dashlane-rid] textarea",
-            
-            # Derniers recours - tout textarea visible
-            "textarea",
-        ]
+        # Chemin le plus rapide : le sélecteur qui a fonctionné la dernière fois sur cette origine
+        cache_key = urlparse(current_url).netloc
+        cached_selector = self._selector_cache.get(cache_key)
+        if cached_selector:
+            try:
+                element = page.locator(cached_selector).first
+                # is_visible() vaut False sans correspondance : un seul aller-retour suffit
+                if await element.is_visible():
+                    logger.info("✅ Champ de saisie trouvé via le cache", selector=cached_selector)
+                    return element
+            except Exception as e:
+                logger.debug("Erreur sur le sélecteur en cache", selector=cached_selector, error=str(e))
+            # Sélecteur périmé : invalider et relancer la découverte
+            self._selector_cache.pop(cache_key, None)
         
-        # Combiner tous les sélecteurs (spécifiques + fallbacks)
-        all_selectors = specific_selectors + fallback_selectors
+        # Mode rapide (tentatives intermédiaires) : une seule attente courte sur l'union
+        if fast:
+            try:
+                await page.wait_for_selector(_SPECIFIC_SELECTOR_UNION, state="visible", timeout=1000)
+                await self._remember_selector(self._selector_cache, cache_key, _SPECIFIC_SELECTOR_UNION)
+                return page.locator(_SPECIFIC_SELECTOR_UNION).first
+            except TimeoutError:
+                logger.info("Mode rapide : champ de saisie non trouvé", url=current_url)
+                return None
         
-        # Essayer chaque sélecteur avec logging détaillé
-        for i, selector in enumerate(all_selectors):
+        # Chemin rapide : une seule requête sur l'union des sélecteurs spécifiques
+        if cached_selector != _SPECIFIC_SELECTOR_UNION:
             try:
-                element = page.locator(selector).first
-                count = await element.count()
-                
-                if count > 0:
-                    is_visible = await element.is_visible()
-                    is_enabled = not await element.is_disabled() if hasattr(element, 'is_disabled') else True
-                    
-                    logger.info(f"Sélecteur testé [{i+1}/{len(all_selectors)}]", 
-                               selector=selector, 
-                               count=count, 
-                               visible=is_visible,
-                               enabled=is_enabled,
-                               priority="spécifique" if i < len(specific_selectors) else "fallback")
-                    
-                    if is_visible and is_enabled:
-                        logger.info("✅ Champ de saisie trouvé avec succès", 
-                                   selector=selector,
-                                   context="conversation" if is_conversation_page else "nouvelle")
-                        return element
-                else:
-                    logger.debug(f"Sélecteur sans résultat [{i+1}/{len(all_selectors)}]", selector=selector)
-                    
+                element = page.locator(_SPECIFIC_SELECTOR_UNION).first
+                # is_visible() vaut False sans correspondance : pas besoin de count() préalable
+                if await element.is_visible() and await element.is_enabled():
+                    logger.info("✅ Champ de saisie trouvé avec succès", 
+                               selector="union",
+                               context="conversation" if is_conversation_page else "nouvelle")
+                    await self._remember_selector(self._selector_cache, cache_key, _SPECIFIC_SELECTOR_UNION)
+                    return element
             except Exception as e:
-                logger.debug(f"Erreur sélecteur [{i+1}/{len(all_selectors)}]", 
-                           selector=selector, 
-                           error=str(e))
-                continue
+                logger.debug("Erreur sur l'union de sélecteurs", error=str(e))
+        
+        # Essayer chaque sélecteur (logging détaillé uniquement en DEBUG)
+        debug = _stdlib_logger.isEnabledFor(logging.DEBUG)
+        try:
+            # Un seul evaluate pour tous les sélecteurs au lieu de count()/is_visible() successifs
+            states = await page.evaluate(_SELECTOR_STATES_JS, _ALL_INPUT_SELECTORS)
+            
+            for i, (selector, state) in enumerate(zip(_ALL_INPUT_SELECTORS, states)):
+                count = state["count"]
+                if count == 0:
+                    if debug:
+                        logger.debug(f"Sélecteur sans résultat [{i+1}/{len(_ALL_INPUT_SELECTORS)}]", selector=selector)
+                    continue
+                
+                is_visible = state["visible"]
+                is_enabled = not state["disabled"]
+                
+                if debug:
+                    logger.debug(f"Sélecteur testé [{i+1}/{len(_ALL_INPUT_SELECTORS)}]", 
+                                selector=selector, 
+                                count=count, 
+                                visible=is_visible,
+                                enabled=is_enabled,
+                                priority="spécifique" if i < len(_SPECIFIC_SELECTORS) else "fallback")
+                
+                if is_visible and is_enabled:
+                    logger.info("✅ Champ de saisie trouvé avec succès", 
+                               selector=selector,
+                               context="conversation" if is_conversation_page else "nouvelle")
+                    await self._remember_selector(self._selector_cache, cache_key, selector)
+                    return page.locator(selector).first
+        except Exception as e:
+            # Typiquement une navigation pendant le scan : on passe au mode permissif
+            logger.warning("Erreur pendant le scan des sélecteurs", error=str(e))
         
         # Si aucun sélecteur ne fonctionne, essayer une approche très permissive
         logger.warning("⚠️ Tentative de détection permissive avec tous les textarea")
         try:
+            # Un seul aller-retour : état de tous les textarea
             all_textareas = page.locator("textarea")
-            count = await all_textareas.count()
-            logger.info(f"Nombre total de textarea trouvés: {count}")
-            
-            for i in range(count):
-                textarea = all_textareas.nth(i)
-                if await textarea.is_visible() and not await textarea.is_disabled():
-                    placeholder = await textarea.get_attribute("placeholder") or ""
-                    logger.info(f"Textarea permissif [{i+1}/{count}]", placeholder=placeholder)
+            candidates = await all_textareas.evaluate_all(_ELEMENT_STATES_JS)
+            logger.info(f"Nombre total de textarea trouvés: {len(candidates)}")
+            
+            for i, candidate in enumerate(candidates):
+                if candidate["visible"] and not candidate["disabled"]:
+                    placeholder = candidate["placeholder"] or ""
+                    logger.info(f"Textarea permissif [{i+1}/{len(candidates)}]", placeholder=placeholder)
                     
                     # Accepter tout textarea visible et non désactivé
                     logger.info("✅ Champ de saisie trouvé en mode permissif", placeholder=placeholder)
-                    return textarea
+                    return all_textareas.nth(i)
         except Exception as e:
             logger.error("Erreur en mode permissif", error=str(e))
         
@@ -1006,8 +1807,8 @@ class BrowserAutomation:
         for attempt in range(max_retries + 1):
             logger.info(f"🎯 Tentative {attempt + 1}/{max_retries + 1}")
             
-            # Essayer de trouver le champ de saisie
-            message_input = await self._find_message_input(page)
+            # Essayer de trouver le champ de saisie (scan complet réservé à la dernière tentative)
+            message_input = await self._find_message_input(page, fast=attempt < max_retries)
             
             if message_input:
                 logger.info("✅ Zone de saisie trouvée avec succès", attempt=attempt + 1)
@@ -1051,24 +1852,25 @@ class BrowserAutomation:
             
             # Stratégie 1: Si on a une URL de conversation, y naviguer
             if conversation_url and conversation_url.strip():
-                if current_url != conversation_url:
+                target_id = self._extract_conversation_id(conversation_url)
+                if not target_id or self._extract_conversation_id(current_url) != target_id:
                     logger.info("🔄 Navigation vers URL de conversation cible")
-                    await page.goto(conversation_url, wait_until="networkidle", timeout=settings.page_timeout)
-                    await page.wait_for_timeout(2000)  # Attendre stabilisation
+                    await page.goto(conversation_url, wait_until="domcontentloaded", timeout=_PAGE_TIMEOUT_MS)
+                    await self._wait_for_message_input_ready(page)
                     logger.info("✅ Navigation vers conversation terminée")
                     return True
                 else:
                     logger.info("🔄 Déjà sur la bonne URL, rechargement de la page")
-                    await page.reload(wait_until="networkidle", timeout=settings.page_timeout)
-                    await page.wait_for_timeout(2000)
+                    await page.reload(wait_until="domcontentloaded", timeout=_PAGE_TIMEOUT_MS)
+                    await self._wait_for_message_input_ready(page)
                     logger.info("✅ Rechargement terminé")
                     return True
             
             # Stratégie 2: Si pas d'URL spécifique, aller à la page d'accueil
             else:
                 logger.info("🔄 Navigation vers page d'accueil Manus.ai")
-                await page.goto(settings.manus_base_url, wait_until="networkidle", timeout=settings.page_timeout)
-                await page.wait_for_timeout(2000)
+                await page.goto(_MANUS_BASE_URL, wait_until="domcontentloaded", timeout=_PAGE_TIMEOUT_MS)
+                await self._wait_for_message_input_ready(page)
                 logger.info("✅ Navigation vers accueil terminée")
                 return True
                 
@@ -1076,6 +1878,23 @@ class BrowserAutomation:
             logger.error(f"❌ Erreur lors de la récupération {attempt}", error=str(e))
             return False
     
+    def _union_locator(self, page: Page, selectors: List[str]):
+        """Combine plusieurs sélecteurs (y compris text=...) en un seul locator"""
+        locator = page.locator(selectors[0])
+        for selector in selectors[1:]:
+            locator = locator.or_(page.locator(selector))
+        return locator.first
+    
+    async def _notify_url_callback(self, url_callback, url: str) -> None:
+        """Notifie l'URL de conversation au callback (si fourni et URL valide) sans propager ses erreurs"""
+        if not url_callback or not self._is_valid_manus_url(url):
+            return
+        logger.info("URL de conversation disponible, notification du callback", url=url)
+        try:
+            await url_callback(url)
+        except Exception as e:
+            logger.error("Erreur lors de l'appel du callback URL", error=str(e))
+    
     async def _handle_wide_research_popup(self, page: Page, timeout_seconds: int = 10) -> bool:
         """
         Détecte et gère automatiquement le popup "Wide Research" en cliquant sur "continuer sans Wide Research"
@@ -1090,27 +1909,19 @@ class BrowserAutomation:
         try:
             logger.info("🔍 Vérification de la présence du popup Wide Research")
             
-            # Attendre un peu pour que le popup apparaisse si nécessaire
-            await page.wait_for_timeout(2000)
-            
-            # Sélecteurs pour détecter le popup Wide Research
-            wide_research_selectors = [
-                # Texte spécifique "Wide Research"
-                "text=Wide Research",
-                # Container avec l'image spécifique
-                "img[src*='mapReduceDarkIcon']",
-                # Texte "Analyse complète de tous les documents"
-                "text=Analyse complète de tous les documents",
-                # Container général du popup
-                "div:has-text('Wide Research coûtera')",
-            ]
+            popup = self._union_locator(page, _WIDE_RESEARCH_SELECTORS)
+            
+            # Laisser au popup le temps d'apparaître (retour immédiat dès qu'il est visible)
+            try:
+                await popup.wait_for(state="visible", timeout=2000)
+            except TimeoutError:
+                pass
             
             # Vérifier si le popup est présent
             popup_detected = False
-            for selector in wide_research_selectors:
+            for selector in _WIDE_RESEARCH_SELECTORS:
                 try:
-                    element = page.locator(selector).first
-                    if await element.count() > 0 and await element.is_visible():
+                    if await page.locator(selector).first.is_visible():
                         logger.info("✅ Popup Wide Research détecté", selector=selector)
                         popup_detected = True
                         break
@@ -1121,32 +1932,20 @@ class BrowserAutomation:
                 logger.info("ℹ️ Aucun popup Wide Research détecté")
                 return False
             
-            # Sélecteurs pour le lien "continuer sans Wide Research"
-            skip_selectors = [
-                # Texte exact
-                "a:has-text('ou continuer sans Wide Research')",
-                # Lien avec classe cursor-pointer et underline
-                "a.cursor-pointer.underline:has-text('continuer sans Wide Research')",
-                # Texte partiel
-                "a:has-text('continuer sans')",
-                # Fallback avec tabindex
-                "a[tabindex='0']:has-text('continuer')",
-                # Très permissif
-                "a:has-text('Wide Research')",
-            ]
-            
-            # Essayer de cliquer sur le lien "continuer sans"
-            for i, selector in enumerate(skip_selectors):
+            # Essayer de cliquer sur le lien "continuer sans" (logging détaillé uniquement en DEBUG)
+            debug = _stdlib_logger.isEnabledFor(logging.DEBUG)
+            for i, selector in enumerate(_SKIP_WIDE_RESEARCH_SELECTORS):
                 try:
                     skip_link = page.locator(selector).first
                     count = await skip_link.count()
                     
                     if count > 0:
                         is_visible = await skip_link.is_visible()
-                        logger.info(f"Lien 'continuer sans' testé [{i+1}/{len(skip_selectors)}]", 
-                                   selector=selector, 
-                                   count=count, 
-                                   visible=is_visible)
+                        if debug:
+                            logger.debug(f"Lien 'continuer sans' testé [{i+1}/{len(_SKIP_WIDE_RESEARCH_SELECTORS)}]", 
+                                        selector=selector, 
+                                        count=count, 
+                                        visible=is_visible)
                         
                         if is_visible:
                             # Cliquer sur le lien
@@ -1154,18 +1953,11 @@ class BrowserAutomation:
                             logger.info("✅ Clic effectué sur 'continuer sans Wide Research'")
                             
                             # Attendre que le popup disparaisse
-                            await page.wait_for_timeout(2000)
-                            
-                            # Vérifier que le popup a bien disparu
-                            still_present = False
-                            for check_selector in wide_research_selectors:
-                                try:
-                                    element = page.locator(check_selector).first
-                                    if await element.count() > 0 and await element.is_visible():
-                                        still_present = True
-                                        break
-                                except Exception:
-                                    continue
+                            try:
+                                await popup.wait_for(state="hidden", timeout=3000)
+                                still_present = False
+                            except TimeoutError:
+                                still_present = True
                             
                             if not still_present:
                                 logger.info("✅ Popup Wide Research fermé avec succès")
@@ -1174,26 +1966,30 @@ class BrowserAutomation:
                                 logger.warning("⚠️ Popup Wide Research toujours présent après clic")
                         
                 except Exception as e:
-                    logger.debug(f"Erreur avec sélecteur [{i+1}/{len(skip_selectors)}]", 
-                               selector=selector, 
-                               error=str(e))
+                    if debug:
+                        logger.debug(f"Erreur avec sélecteur [{i+1}/{len(_SKIP_WIDE_RESEARCH_SELECTORS)}]", 
+                                    selector=selector, 
+                                    error=str(e))
                     continue
             
             # Si aucun sélecteur n'a fonctionné, essayer une approche très permissive
             logger.warning("⚠️ Tentative de clic permissif sur tous les liens avec 'continuer'")
             try:
+                # Un seul aller-retour : état et texte de tous les liens
                 all_links = page.locator("a")
-                count = await all_links.count()
+                candidates = await all_links.evaluate_all(_ELEMENT_STATES_JS)
                 
-                for i in range(count):
-                    link = all_links.nth(i)
-                    if await link.is_visible():
-                        text_content = await link.text_content() or ""
+                for i, candidate in enumerate(candidates):
+                    if candidate["visible"]:
+                        text_content = candidate["text"] or ""
                         if "continuer" in text_content.lower() and "wide research" in text_content.lower():
-                            logger.info(f"Lien permissif trouvé [{i+1}/{count}]", text=text_content)
-                            await link.click()
+                            logger.info(f"Lien permissif trouvé [{i+1}/{len(candidates)}]", text=text_content)
+                            await all_links.nth(i).click()
                             logger.info("✅ Clic permissif effectué")
-                            await page.wait_for_timeout(2000)
+                            try:
+                                await popup.wait_for(state="hidden", timeout=3000)
+                            except TimeoutError:
+                                pass
                             return True
                             
             except Exception as e:
@@ -1206,48 +2002,90 @@ class BrowserAutomation:
             logger.error("Erreur lors de la gestion du popup Wide Research", error=str(e))
             return False
     
+    async def _dispose_handle(self, handle: Optional[Any]) -> None:
+        """Libère un handle JS côté navigateur (les pages du pool vivent longtemps), sans erreur si la page a changé"""
+        if handle is None:
+            return
+        try:
+            await handle.dispose()
+        except Exception:
+            pass
+    
     async def _send_message(self, page: Page) -> None:
         """Envoie le message avec protection contre les doubles clics"""
-        # Sélecteurs possibles pour le bouton d'envoi
-        send_selectors = [
-            "button:has-text('Send')",
-            "button:has-text('Envoyer')",
-            "button[type='submit']",
-            "[data-testid='send-button']",
-            ".send-button",
-            "button:has([data-icon='send'])"
-        ]
+        # Essayer d'abord Entrée : le champ rempli garde le focus et c'est le mode d'envoi principal de Manus.ai
+        enter_pressed = False
+        input_handle = None
+        try:
+            snapshot = await page.evaluate(_FOCUSED_INPUT_SNAPSHOT_JS, _MESSAGE_SELECTOR_UNION)
+            if snapshot and snapshot[0].strip():
+                original_text, initial_count = snapshot
+                input_handle = await page.evaluate_handle("() => document.activeElement")
+                await page.keyboard.press("Enter")
+                enter_pressed = True
+                try:
+                    await page.wait_for_function(
+                        _ENTER_SENT_JS,
+                        arg=[input_handle, _MESSAGE_SELECTOR_UNION, initial_count],
+                        timeout=_ENTER_CONFIRM_TIMEOUT_MS
+                    )
+                    logger.info("Message envoyé via touche Entrée")
+                    return
+                except TimeoutError:
+                    current_text, current_count = await input_handle.evaluate(_INPUT_SNAPSHOT_JS, _MESSAGE_SELECTOR_UNION)
+                    if current_count > initial_count or current_text.strip() != original_text.strip():
+                        # Le champ ou le fil a changé : l'envoi est parti, un clic l'enverrait une seconde fois
+                        logger.warning("Envoi via Entrée non confirmé à temps, pas de second envoi")
+                        return
+                    # Entrée a inséré un retour à la ligne : le retirer avant de passer au bouton d'envoi
+                    if current_text != original_text:
+                        await page.keyboard.press("Backspace")
+                    logger.info("Entrée sans effet, recherche du bouton d'envoi")
+        except Exception as e:
+            if enter_pressed:
+                # État inconnu après Entrée (ex: navigation) : ne pas risquer un double envoi
+                logger.warning("Vérification de l'envoi via Entrée impossible, pas de second envoi", error=str(e))
+                return
+            logger.warning("Envoi via Entrée impossible", error=str(e))
+        finally:
+            await self._dispose_handle(input_handle)
         
-        # Essayer d'abord les boutons
-        for selector in send_selectors:
+        # Sinon le bouton : une seule requête sur l'union des sélecteurs
+        handle = None
+        try:
+            button = page.locator(_SEND_BUTTON_UNION).first
+            await button.wait_for(state="visible", timeout=2000)
+            handle = await button.element_handle()
+            
+            # Vérifier que le bouton n'est pas désactivé et relever le nombre de messages (un seul aller-retour)
+            is_enabled, initial_count = await handle.evaluate(
+                "(button, selector) => [!button.disabled, document.querySelectorAll(selector).length]",
+                _MESSAGE_SELECTOR_UNION
+            )
+            if not is_enabled:
+                logger.warning("Bouton d'envoi désactivé, attente...")
+                await handle.wait_for_element_state("enabled", timeout=1000)
+            
+            # Clic unique avec protection (l'envoi passe par XHR : pas d'attente de navigation après le clic)
+            await handle.click(force=False, timeout=5000, no_wait_after=True)
+            logger.info("Message envoyé via bouton")
+            
+            # Attendre que le bouton soit désactivé/disparaisse ou qu'un message apparaisse (confirmation d'envoi)
             try:
-                button = page.locator(selector).first
-                if await button.count() > 0 and await button.is_visible():
-                    # Vérifier que le bouton n'est pas désactivé
-                    is_disabled = await button.is_disabled()
-                    if is_disabled:
-                        logger.warning("Bouton d'envoi désactivé, attente...", selector=selector)
-                        await page.wait_for_timeout(1000)
-                        continue
-                    
-                    # Clic unique avec protection
-                    await button.click(force=False, timeout=5000)
-                    logger.info("Message envoyé via bouton", selector=selector)
-                    
-                    # Attendre que le bouton soit désactivé ou disparaisse (confirmation d'envoi)
-                    try:
-                        await page.wait_for_function(
-                            f"!document.querySelector('{selector}') || document.querySelector('{selector}').disabled",
-                            timeout=3000
-                        )
-                        logger.info("Confirmation d'envoi détectée")
-                    except:
-                        logger.warning("Pas de confirmation d'envoi détectée")
-                    
-                    return
-            except Exception as e:
-                logger.warning("Erreur avec le bouton", selector=selector, error=str(e))
-                continue
+                await page.wait_for_function(
+                    _SEND_CONFIRM_JS,
+                    arg=[handle, _MESSAGE_SELECTOR_UNION, initial_count],
+                    timeout=3000
+                )
+                logger.info("Confirmation d'envoi détectée")
+            except Exception:
+                logger.warning("Pas de confirmation d'envoi détectée")
+            
+            return
+        except Exception as e:
+            logger.warning("Aucun bouton d'envoi utilisable", error=str(e))
+        finally:
+            await self._dispose_handle(handle)
         
         # Si aucun bouton trouvé, essayer Entrée (avec protection similaire)
         try:
@@ -1268,34 +2106,29 @@ class BrowserAutomation:
     async def _wait_for_ai_response(self, page: Page, timeout_seconds: int) -> Optional[str]:
         """Attend et récupère la réponse de l'IA"""
         try:
-            # Attendre l'apparition de nouveaux messages
-            await asyncio.sleep(2)  # Délai initial pour laisser le temps au message d'être traité
-            
-            # Sélecteurs pour les messages de réponse
-            response_selectors = [
-                ".message:last-child",
-                ".chat-message:last-child",
-                ".ai-response:last-child",
-                "[data-role='assistant']:last-child"
-            ]
-            
-            end_time = asyncio.get_event_loop().time() + timeout_seconds
+            # Laisser le temps au message d'être traité : fin de l'activité réseau (2s max)
+            try:
+                await page.wait_for_load_state("networkidle", timeout=2000)
+            except TimeoutError:
+                pass
             
-            while asyncio.get_event_loop().time() < end_time:
-                for selector in response_selectors:
-                    try:
-                        messages = page.locator(selector)
-                        if await messages.count() > 0:
-                            last_message = messages.last
-                            if await last_message.is_visible():
-                                response_text = await last_message.text_content()
-                                if response_text and len(response_text.strip()) > 0:
-                                    logger.info("Réponse IA récupérée", length=len(response_text))
-                                    return response_text.strip()
-                    except Exception:
-                        continue
-                
-                await asyncio.sleep(1)  # Attendre 1 seconde avant de réessayer
+            # Sélecteurs pour les messages de réponse (le dernier gagnant sur cette origine en premier)
+            cache_key = urlparse(page.url).netloc
+            preferred = self._response_selector_cache.get(cache_key)
+            if preferred in _RESPONSE_SELECTORS:
+                response_selectors = [preferred] + [s for s in _RESPONSE_SELECTORS if s != preferred]
+            else:
+                response_selectors = _RESPONSE_SELECTORS
+            
+            # Attente côté navigateur : un MutationObserver suit le dernier message jusqu'à stabilisation
+            response = await page.evaluate(
+                _AI_RESPONSE_WAIT_JS,
+                [response_selectors, timeout_seconds * 1000, _AI_RESPONSE_SETTLE_MS]
+            )
+            if response:
+                await self._remember_selector(self._response_selector_cache, cache_key, response["selector"])
+                logger.info("Réponse IA récupérée", length=len(response["text"]), selector=response["selector"])
+                return response["text"]
             
             logger.warning("Timeout lors de l'attente de la réponse IA")
             return None
@@ -1312,8 +2145,17 @@ class BrowserAutomation:
             logger.info("Tentative de login automatique", email=email)
             
             # Aller à la page de login spécifique
-            await page.goto("https://manus.im/login?type=signIn", wait_until="networkidle")
-            await page.wait_for_timeout(2000)
+            await page.goto("https://manus.im/login?type=signIn", wait_until="domcontentloaded")
+            
+            # Attendre le formulaire de login ou une redirection (déjà connecté), au premier des deux
+            continue_email_button = 'button:has-text("Continue with email")'
+            try:
+                await page.wait_for_function("""
+                    () => /dashboard|conversation|chat/.test(location.href)
+                        || [...document.querySelectorAll('button')].some(b => b.textContent.includes('Continue with email'))
+                """, timeout=10000)
+            except TimeoutError:
+                pass
             
             # Vérifier si on est déjà connecté
             if "dashboard" in page.url or "conversation" in page.url or "chat" in page.url:
@@ -1321,12 +2163,10 @@ class BrowserAutomation:
                 return True
             
             # Étape 1: Cliquer sur "Continue with email"
-            continue_email_button = 'button:has-text("Continue with email")'
             try:
                 await page.wait_for_selector(continue_email_button, timeout=10000)
                 await page.click(continue_email_button)
                 logger.info("Bouton 'Continue with email' cliqué")
-                await page.wait_for_timeout(2000)
             except Exception as e:
                 logger.error("Impossible de cliquer sur 'Continue with email'", error=str(e))
                 return False
@@ -1356,23 +2196,21 @@ class BrowserAutomation:
                 await page.wait_for_selector(captcha_frame, timeout=5000)
                 logger.warning("CAPTCHA hCaptcha détecté - nécessite intervention manuelle ou service de résolution")
                 
-                # Pour l'instant, on attend 30 secondes pour que l'utilisateur le fasse manuellement
+                # Pour l'instant, on attend (30 secondes max) que l'utilisateur le fasse manuellement
                 logger.info("Attente de 30 secondes pour résolution manuelle du CAPTCHA...")
-                await page.wait_for_timeout(30000)
+                try:
+                    await page.wait_for_selector(captcha_frame, state="detached", timeout=30000)
+                except TimeoutError:
+                    pass
                 
             except:
                 logger.info("Pas de CAPTCHA détecté ou déjà résolu")
             
             # Étape 4: Cliquer sur le bouton Sign in
-            signin_button = 'button:has-text("Sign in")'
+            signin_button = page.locator('button:has-text("Sign in")').first
             try:
-                # Attendre que le bouton soit activé (plus de disabled)
-                await page.wait_for_function(
-                    f"document.querySelector('{signin_button}') && !document.querySelector('{signin_button}').disabled",
-                    timeout=35000
-                )
-                
-                await page.click(signin_button)
+                # click() attend lui-même que le bouton soit visible et activé (plus de disabled)
+                await signin_button.click(timeout=35000)
                 logger.info("Bouton 'Sign in' cliqué")
                 
             except Exception as e:
@@ -1380,7 +2218,13 @@ class BrowserAutomation:
                 return False
             
             # Étape 5: Attendre la redirection
-            await page.wait_for_timeout(5000)
+            try:
+                await page.wait_for_url(
+                    lambda url: any(keyword in url for keyword in ["dashboard", "conversation", "chat", "app"]),
+                    timeout=15000
+                )
+            except TimeoutError:
+                pass
             
             # Vérifier si le login a réussi
             current_url = page.url
@@ -1427,13 +2271,19 @@ class BrowserAutomation:
                        file_path=file_path,
                        conversation_url=conversation_url or "nouvelle_conversation")
             
-            # Vérifier que le fichier existe et est un .zip
-            if not os.path.exists(file_path):
+            # Vérifier que le fichier existe (un seul stat, réutilisé pour la taille) et est un .zip
+            zip_path = Path(file_path)
+            try:
+                zip_stat = zip_path.stat()
+            except FileNotFoundError:
                 raise Exception(f"Fichier non trouvé: {file_path}")
             
             if not file_path.lower().endswith('.zip'):
                 raise Exception("Seuls les fichiers .zip sont supportés")
             
+            if not _is_valid_zip(file_path):
+                raise Exception(f"Fichier .zip invalide (signature ZIP absente): {file_path}")
+            
             # Récupérer ou créer une page appropriée
             # Pour les nouvelles conversations, utiliser la page partagée
             page_key = conversation_url if conversation_url and conversation_url.strip() else "shared"
@@ -1444,44 +2294,33 @@ class BrowserAutomation:
                 current_url = page.url
                 if self._extract_conversation_id(current_url) != self._extract_conversation_id(conversation_url):
                     logger.info("Navigation vers conversation existante", url=conversation_url)
-                    await page.goto(conversation_url, wait_until="networkidle")
+                    await page.goto(conversation_url, wait_until="domcontentloaded")
                 else:
                     logger.info("Page déjà sur la bonne conversation", url=current_url)
+            elif await self._is_on_ready_home_page(page):
+                logger.info("Page déjà sur l'accueil Manus.ai, navigation évitée", url=page.url)
             else:
                 logger.info("Navigation vers Manus.ai (nouvelle conversation)")
-                await page.goto(settings.manus_base_url, wait_until="networkidle")
+                await page.goto(_MANUS_BASE_URL, wait_until="domcontentloaded")
             
             # Attendre que l'interface soit chargée
-            await page.wait_for_timeout(5000)
+            await self._wait_for_message_input_ready(page)
             
-            # Diagnostic de l'état de la page avant recherche
+            # Diagnostic de l'état de la page avant recherche : titre et indicateurs en parallèle
+            # (une seule requête sur l'union des indicateurs, is_visible renvoie False sans correspondance)
             current_url = page.url
-            page_title = await page.title()
+            page_title, is_logged_out = await asyncio.gather(
+                page.title(),
+                self._union_locator(page, _LOGGED_OUT_INDICATORS).is_visible()
+            )
             logger.info("🔍 Diagnostic de la page avant recherche de zone de saisie", 
                        url=current_url, 
                        title=page_title)
             
             # Vérifier si l'utilisateur est connecté
             try:
-                # Chercher des indicateurs de connexion
-                login_indicators = [
-                    "text=Se connecter", "text=Sign in", "text=Login",
-                    "input[type='email']", "input[type='password']",
-                    "button:has-text('Se connecter')", "button:has-text('Sign in')"
-                ]
-                
-                is_logged_out = False
-                for indicator in login_indicators:
-                    try:
-                        element = page.locator(indicator).first
-                        if await element.count() > 0 and await element.is_visible():
-                            logger.warning("⚠️ Indicateur de déconnexion détecté", indicator=indicator)
-                            is_logged_out = True
-                            break
-                    except Exception:
-                        continue
-                
                 if is_logged_out:
+                    logger.warning("⚠️ Indicateur de déconnexion détecté")
                     raise Exception("Utilisateur non connecté à Manus.ai - session expirée ou credentials invalides")
                 else:
                     logger.info("✅ Aucun indicateur de déconnexion détecté")
@@ -1496,32 +2335,11 @@ class BrowserAutomation:
                 # Diagnostic détaillé en cas d'échec
                 logger.error("❌ DIAGNOSTIC DÉTAILLÉ - Zone de saisie non trouvée")
                 logger.error("URL actuelle", url=page.url)
-                logger.error("Titre de page", title=await page.title())
                 
-                # Capturer le HTML pour diagnostic
+                # Capturer URL, titre et champs de la page pour diagnostic (un seul appel CDP)
                 try:
-                    html_snippet = await page.evaluate("""
-                        () => {
-                            // Chercher tous les textarea et input
-                            const textareas = Array.from(document.querySelectorAll('textarea'));
-                            const inputs = Array.from(document.querySelectorAll('input'));
-                            
-                            return {
-                                textareas: textareas.map(t => ({
-                                    placeholder: t.placeholder,
-                                    visible: t.offsetParent !== null,
-                                    disabled: t.disabled
-                                })),
-                                inputs: inputs.map(i => ({
-                                    type: i.type,
-                                    placeholder: i.placeholder,
-                                    visible: i.offsetParent !== null,
-                                    disabled: i.disabled
-                                })),
-                                bodyText: document.body.innerText.substring(0, 500)
-                            };
-                        }
-                    """)
+                    html_snippet = await page.evaluate(_INPUT_DIAGNOSTIC_JS)
+                    logger.error("Titre de page", title=html_snippet.pop("title"), url=html_snippet.pop("url"))
                     logger.error("Éléments détectés sur la page", elements=html_snippet)
                 except Exception as diag_e:
                     logger.error("Impossible de capturer le diagnostic HTML", error=str(diag_e))
@@ -1530,14 +2348,11 @@ class BrowserAutomation:
             
             logger.info("Zone de chat trouvée, préparation du drag & drop")
             
-            # Lire le fichier en tant que buffer pour le drag & drop
-            logger.info("📖 Lecture du fichier ZIP en mémoire...")
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            filename = os.path.basename(file_path)
-            file_size_mb = len(file_content) / (1024 * 1024)
-            logger.info(f"✅ Fichier lu: {filename}, taille: {len(file_content)} bytes ({file_size_mb:.1f} MB)")
+            # Taille lue sur le disque : le contenu n'est chargé en mémoire que pour le drag & drop
+            filename = zip_path.name
+            file_size = zip_stat.st_size
+            file_size_mb = file_size / (1024 * 1024)
+            logger.info(f"✅ Fichier trouvé: {filename}, taille: {file_size} bytes ({file_size_mb:.1f} MB)")
             
             # Ajuster le timeout selon la taille du fichier
             if file_size_mb > 50:
@@ -1565,12 +2380,12 @@ class BrowserAutomation:
                 await paperclip_button.click()
                 
                 # Attendre que le dialog apparaisse
-                await page.wait_for_timeout(1000)
+                local_files_option = page.locator('text=Choisir des fichiers locaux').first
+                await local_files_option.wait_for(state="visible", timeout=5000)
                 logger.info("✅ Dialog paperclip ouvert")
                 
                 # Étape 2: Cliquer sur "Choisir des fichiers locaux"
                 logger.info("📂 Clic sur 'Choisir des fichiers locaux'...")
-                local_files_option = page.locator('text=Choisir des fichiers locaux').first
                 
                 # Préparer l'écoute de l'input file qui va s'ouvrir
                 async with page.expect_file_chooser() as fc_info:
@@ -1609,134 +2424,29 @@ class BrowserAutomation:
                 
             except Exception as e:
                 logger.warning(f"⚠️ Échec méthode paperclip: {str(e)}")
+                upload_result = {"success": False}
+                
+                # Fallback 1 : input file existant, le fichier est transmis en binaire par Playwright
+                file_input = page.locator('input[type="file"]').first
+                try:
+                    if await file_input.count() > 0:
+                        logger.info("🔄 Fallback vers l'input file natif...")
+                        await file_input.set_input_files(file_path, timeout=timeout_seconds * 1000)
+                        upload_result = {"success": True, "method": "file_input_native", "fileInputFound": True}
+                except Exception as input_e:
+                    logger.warning(f"⚠️ Échec input file natif: {str(input_e)}")
+                
+            if not upload_result.get("success"):
                 logger.info("🔄 Fallback vers drag & drop...")
                 
-                # Fallback vers l'ancienne méthode drag & drop
+                # Fallback 2 : drag & drop simulé, contenu transmis en base64 (et non octet par octet)
+                logger.info("📖 Lecture du fichier ZIP en mémoire...")
+                file_content = await asyncio.to_thread(Path(file_path).read_bytes)
                 upload_result = await asyncio.wait_for(
-                    page.evaluate("""
-                        async (fileData) => {
-                        const { fileName, fileContent } = fileData;
-                        
-                        try {
-                            // Créer un objet File à partir du buffer
-                            const uint8Array = new Uint8Array(fileContent);
-                            const file = new File([uint8Array], fileName, { 
-                                type: 'application/zip',
-                                lastModified: Date.now()
-                            });
-                            
-                            // Chercher la zone de drop - ULTRA-PERMISSIF
-                            const dropZoneSelectors = [
-                                // Sélecteurs spécifiques Manus.ai
-                                'textarea[placeholder="Attribuez une tâche ou posez une question"]',
-                                'textarea[placeholder="Assign a task or ask anything"]',
-                                'textarea[placeholder*="Attribuez"]',
-                                'textarea[placeholder*="Assign"]',
-                                'textarea[placeholder*="tâche"]',
-                                'textarea[placeholder*="task"]',
-                                'textarea[placeholder*="question"]',
-                                'textarea[placeholder*="anything"]',
-                                'textarea[placeholder*="posez"]',
-                                'textarea[placeholder*="message"]',
-                                'textarea[placeholder*="Message"]',
-                                'textarea[placeholder*="Send message"]',
-                                'textarea[placeholder*="Envoyer"]',
-                                'textarea[placeholder*="Écrivez"]',
-                                'textarea[placeholder*="Write"]',
-                                
-                                // Sélecteurs génériques
-                                'textarea:not([readonly]):not([disabled])',
-                                'textarea[rows]',
-                                'textarea.resize-none',
-                                'input[type="text"]:not([readonly]):not([disabled])',
-                                '[contenteditable="true"]',
-                                
-                                // Conteneurs
-                                '.chat-input-container',
-                                '.message-input-container', 
-                                '.input-container',
-                                '.chat-container',
-                                '.text-input-container',
-                                
-                                // Fallbacks larges
-                                '.main-content',
-                                'main',
-                                'body'
-                            ];
-                            
-                            let dropZone = null;
-                            for (const selector of dropZoneSelectors) {
-                                dropZone = document.querySelector(selector);
-                                if (dropZone) {
-                                    console.log('Zone de drop trouvée:', selector);
-                                    break;
-                                }
-                            }
-                            
-                            if (!dropZone) {
-                                throw new Error('Aucune zone de drop trouvée');
-                            }
-                            
-                            // Créer les événements de drag & drop
-                            const dataTransfer = new DataTransfer();
-                            dataTransfer.items.add(file);
-                            
-                            // Simuler la séquence complète de drag & drop
-                            const events = [
-                                new DragEvent('dragenter', {
-                                    bubbles: true,
-                                    cancelable: true,
-                                    dataTransfer: dataTransfer
-                                }),
-                                new DragEvent('dragover', {
-                                    bubbles: true,
-                                    cancelable: true,
-                                    dataTransfer: dataTransfer
-                                }),
-                                new DragEvent('drop', {
-                                    bubbles: true,
-                                    cancelable: true,
-                                    dataTransfer: dataTransfer
-                                })
-                            ];
-                            
-                            // Déclencher les événements avec des délais
-                            for (const event of events) {
-                                dropZone.dispatchEvent(event);
-                                await new Promise(resolve => setTimeout(resolve, 100));
-                            }
-                            
-                            // Vérifier si un input file est disponible comme fallback
-                            const fileInput = document.querySelector('input[type="file"]');
-                            if (fileInput) {
-                                console.log('Input file trouvé comme fallback');
-                                // Simuler la sélection de fichier sur l'input
-                                const dt = new DataTransfer();
-                                dt.items.add(file);
-                                fileInput.files = dt.files;
-                                
-                                // Déclencher l'événement change
-                                const changeEvent = new Event('change', { bubbles: true });
-                                fileInput.dispatchEvent(changeEvent);
-                            }
-                            
-                            return {
-                                success: true,
-                                message: `Fichier ${fileName} uploadé avec succès`,
-                                dropZoneFound: !!dropZone,
-                                fileInputFound: !!fileInput
-                            };
-                            
-                        } catch (error) {
-                            return {
-                                success: false,
-                                error: error.message
-                            };
-                        }
-                        }
-                    """, {
+                    page.evaluate(_DROP_FILE_JS, {
                         "fileName": filename,
-                        "fileContent": list(file_content)
+                        "fileBase64": base64.b64encode(file_content).decode("ascii"),
+                        "dropZoneTiers": list(_DROP_ZONE_SELECTOR_TIERS)
                     }),
                     timeout=timeout_seconds  # Timeout en secondes pour asyncio.wait_for()
                 )
@@ -1754,22 +2464,24 @@ class BrowserAutomation:
                        file_input_found=upload_result.get("fileInputFound"))
             logger.info("⏳ Attente du traitement par Manus.ai...")
             
-            # Pour la méthode paperclip, pas besoin d'attendre longtemps
+            # Pour la méthode paperclip, le bouton d'envoi activé confirme déjà la fin de l'upload
             if upload_result.get("method") == "paperclip_native":
                 logger.info("🚀 Méthode paperclip - upload déjà terminé, ajout direct du message")
-                await page.wait_for_timeout(1000)  # Juste 1s pour stabilisation
             else:
-                # Attendre que l'upload soit traité par l'interface (plus long pour gros fichiers)
-                await page.wait_for_timeout(10000)
+                # Attendre que la pièce jointe apparaisse dans l'interface (10s max)
+                try:
+                    await page.wait_for_selector(_ATTACHMENT_SELECTOR_UNION, timeout=10000)
+                    logger.info("✅ Pièce jointe affichée par l'interface")
+                except TimeoutError:
+                    logger.warning("⚠️ Pièce jointe non détectée après 10s, poursuite de l'envoi")
             
             # Ajouter le message d'accompagnement si fourni
             if message.strip():
                 logger.info("📝 Ajout du message d'accompagnement")
                 message_input = await self._find_message_input_with_recovery(page, conversation_url)
                 if message_input:
-                    # S'assurer que le champ est vide d'abord
-                    await message_input.clear()
-                    await message_input.fill(message)
+                    # fill() remplace le contenu existant : pas besoin de clear() préalable
+                    await message_input.fill(message, no_wait_after=True)
                     logger.info(f"✅ Message ajouté: '{message[:50]}...'")
                 else:
                     logger.warning("⚠️ Impossible de trouver la zone de saisie pour le message d'accompagnement")
@@ -1800,9 +2512,15 @@ class BrowserAutomation:
                 logger.info("📤 Clic sur le bouton Envoyer")
                 await self._send_message(page)
                 
-                # Étape 3: Attendre 5 secondes puis vérifier l'URL
-                logger.info("⏳ Attente 5 secondes puis vérification URL...")
-                await page.wait_for_timeout(5000)
+                # Étape 3: Attendre (5 secondes max) l'URL de conversation
+                logger.info("⏳ Attente 5 secondes max puis vérification URL...")
+                try:
+                    await page.wait_for_url(
+                        lambda url: "/app/" in url and len(url.split("/app/")[-1]) > 10,
+                        timeout=5000
+                    )
+                except TimeoutError:
+                    pass
                 
                 current_url = page.url
                 logger.info(f"🔍 URL actuelle: {current_url}")
@@ -1819,23 +2537,19 @@ class BrowserAutomation:
                     else:
                         logger.info("🔄 Nouvelle tentative dans 5 secondes...")
             
-            # Gérer le popup "Wide Research" s'il apparaît
-            await self._handle_wide_research_popup(page)
-            
-            # Récupérer l'URL dès qu'elle est disponible et notifier via callback
-            current_url = page.url
-            if url_callback and self._is_valid_manus_url(current_url):
-                logger.info("URL de conversation disponible, notification du callback", url=current_url)
-                try:
-                    await url_callback(current_url)
-                except Exception as e:
-                    logger.error("Erreur lors de l'appel du callback URL", error=str(e))
+            async def handle_popup_then_notify() -> None:
+                await self._handle_wide_research_popup(page)
+                # URL lue une fois le popup traité (comme avant la parallélisation)
+                await self._notify_url_callback(url_callback, page.url)
             
-            # Attendre la réponse si demandé
-            ai_response = None
+            # Popup "Wide Research" puis notification de l'URL, en parallèle de l'attente de la réponse
+            # (chaque étape gère ses propres erreurs)
+            steps = [handle_popup_then_notify()]
             if wait_for_response:
                 logger.info("Attente de la réponse de l'IA", timeout=timeout_seconds)
-                ai_response = await self._wait_for_ai_response(page, timeout_seconds)
+                steps.append(self._wait_for_ai_response(page, timeout_seconds))
+            results = await asyncio.gather(*steps)
+            ai_response = results[1] if wait_for_response else None
             
             # Récupérer l'URL finale de la conversation
             final_url = page.url
@@ -1845,7 +2559,7 @@ class BrowserAutomation:
                 logger.warning("URL finale invalide détectée lors de l'upload, correction...", invalid_url=final_url)
                 try:
                     # Essayer de naviguer vers Manus.ai pour corriger
-                    await page.goto(settings.manus_base_url, wait_until="networkidle")
+                    await page.goto(_MANUS_BASE_URL, wait_until="domcontentloaded")
                     corrected_url = page.url
                     logger.info("URL corrigée après upload", corrected_url=corrected_url)
                     final_url = corrected_url
@@ -1885,10 +2599,14 @@ class BrowserAutomation:
             }
             
         finally:
+            # La page (conversation ou partagée) reste ouverte dans le pool
+            if page:
+                await self._checkin_page(page)
+            
             # Nettoyer le fichier temporaire
             try:
-                if file_path and os.path.exists(file_path) and file_path.startswith('/tmp/'):
-                    os.unlink(file_path)
+                if file_path and file_path.startswith('/tmp/'):
+                    Path(file_path).unlink(missing_ok=True)
                     logger.info("Fichier temporaire nettoyé", file_path=file_path)
             except Exception as e:
                 logger.warning("Impossible de nettoyer le fichier temporaire", file_path=file_path, error=str(e))
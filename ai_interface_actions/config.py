@@ -1,6 +1,7 @@
 """
 Configuration de l'application avec validation Pydantic
 """
+from functools import lru_cache
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
@@ -13,7 +14,8 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
-        extra="ignore"
+        extra="ignore",
+        frozen=True
     )
     
     # Configuration API
@@ -31,6 +33,12 @@ class Settings(BaseSettings):
     disable_javascript: bool = Field(default=False, description="Désactiver JavaScript (pour debug)")
     browser_timeout: int = Field(default=300000, description="Timeout global du navigateur (ms)")  # 5 minutes
     page_timeout: int = Field(default=180000, description="Timeout de chargement des pages (ms)")  # 3 minutes
+    context_pool_size: int = Field(default=4, description="Nombre de contextes pré-chauffés pour les nouvelles conversations (0 = désactivé)")
+    max_uses_per_context: int = Field(default=50, description="Nombre d'utilisations d'un contexte du pool avant recyclage")
+    manus_cdp_endpoint: str = Field(default="", description="Endpoint CDP d'un Chromium partagé (ex: http://localhost:9222) - vide = lancer un navigateur dédié")
+    avoid_images: bool = Field(default=True, description="Bloquer images, polices et médias en mode headless")
+    avoid_css: bool = Field(default=False, description="Bloquer les feuilles de style en mode headless (peut fausser la détection de visibilité)")
+    avoid_ads: bool = Field(default=True, description="Bloquer les domaines publicitaires/analytics en mode headless")
     
     # Configuration Manus.ai
     manus_base_url: str = Field(default="https://www.manus.im", description="URL de base de Manus.im")
@@ -56,12 +64,20 @@ class Settings(BaseSettings):
     
     # Rate limiting
     rate_limit_per_minute: int = Field(default=10, description="Limite de requêtes par minute par IP")
+    task_rate_per_second: float = Field(default=0.0, description="Débit moyen de démarrage des tâches (tâches/s, 0 = illimité)")
+    task_burst: int = Field(default=5, description="Nombre de tâches pouvant démarrer d'affilée avant d'appliquer le débit")
     
     # Login automatique Manus
     manus_email: Optional[str] = Field(default=None, description="Email pour login automatique Manus.ai")
     manus_password: Optional[str] = Field(default=None, description="Mot de passe pour login automatique Manus.ai")
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Retourne l'unique instance des paramètres (.env lu une seule fois)"""
+    return Settings()
+
+
 # Instance globale des paramètres
-settings = Settings() 
+settings = get_settings() 
 
@@ -1,50 +1,182 @@
 """
 Client API pour communiquer avec l'API de gestion des credentials IA
 """
+import asyncio
 import httpx
 import json
+import orjson
 import base64
+import functools
+import time
 import structlog
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
 from ai_interface_actions.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Durée de validité d'un credential en cache (les sessions ne changent qu'à la rotation par un admin)
+_CREDENTIAL_CACHE_TTL_SECONDS = 300.0
+
+# Tentatives par requête sur les erreurs 5xx (backoff exponentiel à partir de 100 ms)
+_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY_SECONDS = 0.1
+
+# Cookies de session marqués httpOnly dans le storage_state Playwright
+_HTTPONLY_COOKIES = frozenset({"session_id", "session_token", "auth_token"})
+
+# Attributs communs à tous les cookies de session
+_COOKIE_TEMPLATE = {"path": "/", "secure": True, "sameSite": "Lax"}
+
+
+@functools.lru_cache(maxsize=128)
+def _credential_path(platform: str, user_identifier: str) -> str:
+    """
+    Chemin relatif du credential d'une plateforme/utilisateur (mémorisé par couple)
+    
+    Args:
+        platform: Nom de la plateforme (ex: 'manus')
+        user_identifier: Email ou identifiant utilisateur, encodé en base64 pour l'URL
+        
+    Returns:
+        Chemin relatif à l'URL de base de l'API
+    """
+    encoded_user = base64.b64encode(user_identifier.encode()).decode()
+    return f"/platform/{platform}/user/{encoded_user}"
+
+
+@functools.lru_cache(maxsize=32)
+def _list_params(is_active: bool, limit: int, platform: Optional[str], user_identifier: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    """Paramètres de requête de la liste des credentials, déjà convertis et mémorisés par combinaison de filtres"""
+    params = [("isActive", "true" if is_active else "false"), ("limit", str(limit))]
+    if platform:
+        params.append(("platform", platform))
+    if user_identifier:
+        params.append(("userIdentifier", user_identifier))
+    return tuple(params)
+
 
 class CredentialsAPIClient:
     """Client pour l'API de gestion des credentials IA"""
     
+    __slots__ = ("_base_url", "_api_key", "_timeout", "_headers", "_client", "_cache", "_inflight")
+    
     def __init__(self):
-        self.base_url = settings.credentials_api_url
-        self.api_key = settings.credentials_api_token  # Maintenant utilisé comme clé API
-        self.timeout = settings.credentials_api_timeout
+        # Configuration lue au premier usage seulement (voir _ensure_config)
+        self._base_url: Optional[str] = None
+        self._api_key: Optional[str] = None
+        self._timeout: Optional[int] = None
+        self._headers: Optional[Dict[str, str]] = None
+        
+        # Client HTTP partagé (connexions keep-alive réutilisées), créé au premier appel
+        # pour être lié à la boucle d'événements en cours
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # Cache TTL des credentials : (platform, user_identifier) -> (horodatage, credential, storage_state)
+        self._cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any], Optional[Dict[str, Any]]]] = {}
+        # Requêtes en cours par clé : les appels simultanés pour une même clé partagent la même requête
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+    
+    def _ensure_config(self) -> None:
+        """Lit la configuration de l'API au premier usage (rien à l'import pour les processus qui ne s'en servent pas)"""
+        if self._base_url is not None:
+            return
+        self._api_key = settings.credentials_api_token  # Maintenant utilisé comme clé API
+        self._timeout = settings.credentials_api_timeout
         
-        self.headers = {
-            "Content-Type": "application/json",
-            "X-API-Key": self.api_key if self.api_key else ""  # Utilisation du header X-API-Key
-        }
+        # En-têtes construits une fois et portés par le client partagé (pas de X-API-Key vide)
+        self._headers = {"Content-Type": "application/json"}
+        if self._api_key:
+            self._headers["X-API-Key"] = self._api_key  # Utilisation du header X-API-Key
+        self._base_url = settings.credentials_api_url
+    
+    @property
+    def base_url(self) -> str:
+        """URL de base de l'API de credentials"""
+        self._ensure_config()
+        return self._base_url
+    
+    @property
+    def api_key(self) -> str:
+        """Clé API (X-API-Key)"""
+        self._ensure_config()
+        return self._api_key
+    
+    @property
+    def timeout(self) -> int:
+        """Timeout des requêtes (secondes)"""
+        self._ensure_config()
+        return self._timeout
+    
+    @property
+    def headers(self) -> Dict[str, str]:
+        """En-têtes par défaut du client partagé"""
+        self._ensure_config()
+        return self._headers
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Retourne le client HTTP partagé, créé à la première utilisation"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                # Chemins relatifs résolus sur l'URL de base (liste/création passent l'URL absolue)
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                # Nouvelles tentatives de connexion gérées par le transport ; un transport explicite
+                # ignore http2/limits passés au client, ils sont donc portés par le transport
+                transport=httpx.AsyncHTTPTransport(
+                    retries=3,
+                    # HTTP/2 négocié par ALPN en HTTPS (repli automatique en HTTP/1.1 keep-alive sinon)
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30)
+                )
+            )
+        return self._client
     
-    def _encode_user_identifier(self, user_identifier: str) -> str:
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Envoie une requête en retentant les erreurs serveur (5xx) avec backoff exponentiel (GET uniquement)"""
+        client = self._get_client()
+        # Pas de nouvelle tentative pour les POST : une création rejouée dupliquerait le credential
+        attempts = _MAX_ATTEMPTS if method == "GET" else 1
+        for attempt in range(attempts):
+            response = await client.request(method, url, **kwargs)
+            if response.status_code < 500 or attempt == attempts - 1:
+                return response
+            logger.warning("Erreur serveur de l'API credentials, nouvelle tentative",
+                         status_code=response.status_code, attempt=attempt + 1)
+            await asyncio.sleep(_RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+        return response
+    
+    async def aclose(self) -> None:
+        """Ferme le client HTTP partagé et ses connexions"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def invalidate(self, platform: Optional[str] = None, user_identifier: Optional[str] = None) -> None:
         """
-        Encode l'identifiant utilisateur en base64 pour l'URL
+        Invalide le cache des credentials
         
         Args:
-            user_identifier: Email ou identifiant utilisateur
-            
-        Returns:
-            Identifiant encodé en base64
+            platform: Plateforme à invalider (avec user_identifier), sinon tout le cache est vidé
+            user_identifier: Identifiant utilisateur à invalider
         """
-        try:
-            return base64.b64encode(user_identifier.encode()).decode()
-        except Exception as e:
-            logger.error("Erreur lors de l'encodage de l'identifiant", error=str(e))
-            return user_identifier
+        if platform and user_identifier:
+            self._cache.pop((platform, user_identifier), None)
+        else:
+            self._cache.clear()
+    
+    def _cached_credential(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Retourne le credential en cache s'il est encore valide"""
+        entry = self._cache.get(key)
+        if entry and time.monotonic() - entry[0] < _CREDENTIAL_CACHE_TTL_SECONDS:
+            return entry[1]
+        return None
     
     async def get_credential_for_platform(self, platform: str, user_identifier: str) -> Optional[Dict[str, Any]]:
         """
-        Récupère le credential actif pour une plateforme et un utilisateur
+        Récupère le credential actif pour une plateforme et un utilisateur (avec cache TTL)
         
         Args:
             platform: Nom de la plateforme (ex: 'manus')
@@ -53,43 +185,66 @@ class CredentialsAPIClient:
         Returns:
             Données du credential ou None si non trouvé
         """
+        key = (platform, user_identifier)
+        credential = self._cached_credential(key)
+        if credential is not None:
+            return credential
+        
+        # Un seul appel réseau par clé ; des clés différentes sont récupérées en parallèle
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield : l'annulation d'un appelant n'interrompt pas la requête partagée
+        return await asyncio.shield(task)
+    
+    async def _fetch_and_cache(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Récupère le credential d'une clé et le met en cache en cas de succès"""
+        credential = await self._fetch_credential(*key)
+        if credential is not None:
+            # Conversion au format Playwright faite une fois, à l'entrée dans le cache
+            self._cache[key] = (time.monotonic(), credential, self._build_storage_state(credential))
+        return credential
+    
+    async def _fetch_credential(self, platform: str, user_identifier: str) -> Optional[Dict[str, Any]]:
+        """Interroge l'API pour le credential actif d'une plateforme et d'un utilisateur"""
         try:
             if not self.base_url or not self.api_key:
                 logger.warning("API credentials non configurée, utilisation du fallback local")
                 return None
             
-            # Encoder l'email en base64 pour l'URL
-            encoded_user = self._encode_user_identifier(user_identifier)
-            url = f"{self.base_url}/platform/{platform}/user/{encoded_user}"
+            # Chemin relatif à l'URL de base du client partagé (email encodé en base64)
+            url = _credential_path(platform, user_identifier)
             
-            logger.info("Tentative de récupération credential", 
+            logger.debug("Tentative de récupération credential", 
                        url=url, 
                        platform=platform, 
                        user_identifier=user_identifier)
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=self.headers)
-                
-                if response.status_code == 200:
-                    credential = response.json()
-                    logger.info("Credential récupéré depuis l'API", 
-                              platform=platform, 
-                              user_identifier=user_identifier,
-                              credential_id=credential.get('id'))
-                    return credential
-                elif response.status_code == 404:
-                    logger.info("Aucun credential trouvé pour cette plateforme/utilisateur",
-                              platform=platform, user_identifier=user_identifier)
-                    return None
-                elif response.status_code == 401:
-                    logger.error("Authentification échouée - vérifiez la clé API",
-                               status_code=response.status_code)
-                    return None
-                else:
-                    logger.error("Erreur API lors de la récupération du credential",
-                               status_code=response.status_code,
-                               response=response.text)
-                    return None
+            response = await self._request("GET", url)
+            
+            if response.status_code == 200:
+                credential = orjson.loads(response.content)
+                logger.info("Credential récupéré depuis l'API", 
+                          platform=platform, 
+                          user_identifier=user_identifier,
+                          credential_id=credential.get('id'))
+                return credential
+            elif response.status_code == 404:
+                # Attendu pour un nouvel utilisateur : pas besoin d'un log INFO à chaque appel
+                logger.debug("Aucun credential trouvé pour cette plateforme/utilisateur",
+                          platform=platform, user_identifier=user_identifier)
+                return None
+            elif response.status_code == 401:
+                logger.error("Authentification échouée - vérifiez la clé API",
+                           status_code=response.status_code)
+                return None
+            else:
+                logger.error("Erreur API lors de la récupération du credential",
+                           status_code=response.status_code,
+                           response=response.text)
+                return None
                     
         except Exception as e:
             logger.error("Erreur lors de la communication avec l'API credentials", error=str(e))
@@ -110,22 +265,18 @@ class CredentialsAPIClient:
                 logger.warning("API credentials non configurée")
                 return None
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=self.headers,
-                    json=credential_data
-                )
-                
-                if response.status_code == 200:
-                    credential = response.json()
-                    logger.info("Credential créé avec succès", credential_id=credential.get('id'))
-                    return credential
-                else:
-                    logger.error("Erreur lors de la création du credential",
-                               status_code=response.status_code,
-                               response=response.text)
-                    return None
+            response = await self._request("POST", self.base_url, content=orjson.dumps(credential_data))
+            
+            if response.status_code == 200:
+                credential = orjson.loads(response.content)
+                logger.info("Credential créé avec succès", credential_id=credential.get('id'))
+                self.invalidate()
+                return credential
+            else:
+                logger.error("Erreur lors de la création du credential",
+                           status_code=response.status_code,
+                           response=response.text)
+                return None
                     
         except Exception as e:
             logger.error("Erreur lors de la création du credential", error=str(e))
@@ -147,25 +298,21 @@ class CredentialsAPIClient:
                 logger.warning("API credentials non configurée")
                 return None
             
-            url = f"{self.base_url}/{credential_id}/update"
+            url = f"/{credential_id}/update"
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    url,
-                    headers=self.headers,
-                    json=update_data
-                )
-                
-                if response.status_code == 200:
-                    credential = response.json()
-                    logger.info("Credential mis à jour avec succès", credential_id=credential_id)
-                    return credential
-                else:
-                    logger.error("Erreur lors de la mise à jour du credential",
-                               credential_id=credential_id,
-                               status_code=response.status_code,
-                               response=response.text)
-                    return None
+            response = await self._request("POST", url, content=orjson.dumps(update_data))
+            
+            if response.status_code == 200:
+                credential = orjson.loads(response.content)
+                logger.info("Credential mis à jour avec succès", credential_id=credential_id)
+                self.invalidate()
+                return credential
+            else:
+                logger.error("Erreur lors de la mise à jour du credential",
+                           credential_id=credential_id,
+                           status_code=response.status_code,
+                           response=response.text)
+                return None
                     
         except Exception as e:
             logger.error("Erreur lors de la mise à jour du credential", error=str(e))
@@ -192,33 +339,19 @@ class CredentialsAPIClient:
                 logger.warning("API credentials non configurée")
                 return []
             
-            params = {
-                "isActive": is_active,
-                "limit": limit
-            }
-            
-            if platform:
-                params["platform"] = platform
-            if user_identifier:
-                params["userIdentifier"] = user_identifier
+            params = _list_params(is_active, limit, platform, user_identifier)
+            response = await self._request("GET", self.base_url, params=params)
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.base_url,
-                    headers=self.headers,
-                    params=params
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    credentials = result.get("items", [])
-                    logger.info("Credentials listés avec succès", count=len(credentials))
-                    return credentials
-                else:
-                    logger.error("Erreur lors de la liste des credentials",
-                               status_code=response.status_code,
-                               response=response.text)
-                    return []
+            if response.status_code == 200:
+                result = orjson.loads(response.content)
+                credentials = result.get("items", [])
+                logger.info("Credentials listés avec succès", count=len(credentials))
+                return credentials
+            else:
+                logger.error("Erreur lors de la liste des credentials",
+                           status_code=response.status_code,
+                           response=response.text)
+                return []
                     
         except Exception as e:
             logger.error("Erreur lors de la liste des credentials", error=str(e))
@@ -234,6 +367,14 @@ class CredentialsAPIClient:
         Returns:
             Storage state au format Playwright ou None
         """
+        # Credential issu du cache : réutiliser la conversion déjà faite
+        for _, cached_credential, storage_state in self._cache.values():
+            if cached_credential is credential:
+                return storage_state
+        return self._build_storage_state(credential)
+    
+    def _build_storage_state(self, credential: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Construit le storage_state Playwright à partir des sessionData du credential"""
         try:
             # Gérer la structure imbriquée des données
             session_data = credential.get("sessionData", {})
@@ -246,40 +387,29 @@ class CredentialsAPIClient:
                 logger.warning("Pas de sessionData dans le credential")
                 return None
             
-            # Construire le storage state Playwright
-            storage_state = {
-                "cookies": [],
-                "origins": []
-            }
-            
             # Convertir les cookies avec les bons domaines
+            # (Intercom reste sur .manus.ai, les autres cookies sur .manus.im)
             cookies_data = session_data.get("cookies", {})
-            for name, value in cookies_data.items():
-                # Déterminer le bon domaine selon le cookie
-                if "intercom" in name.lower():
-                    domain = ".manus.ai"  # Intercom reste sur .manus.ai
-                else:
-                    domain = ".manus.im"  # Les autres cookies sur .manus.im
-                
-                storage_state["cookies"].append({
-                    "name": name,
-                    "value": value,
-                    "domain": domain,
-                    "path": "/",
-                    "httpOnly": name in ["session_id", "session_token", "auth_token"],
-                    "secure": True,
-                    "sameSite": "Lax"
-                })
-            
-            # Convertir le localStorage pour manus.im
             local_storage = session_data.get("local_storage", {})
-            if local_storage:
-                storage_state["origins"] = [{
+            storage_state = {
+                "cookies": [
+                    {
+                        **_COOKIE_TEMPLATE,
+                        "name": name,
+                        "value": value,
+                        "domain": ".manus.ai" if "intercom" in name.lower() else ".manus.im",
+                        "httpOnly": name in _HTTPONLY_COOKIES
+                    }
+                    for name, value in cookies_data.items()
+                ],
+                # Convertir le localStorage pour manus.im
+                "origins": [{
                     "origin": "https://www.manus.im",
                     "localStorage": [
                         {"name": k, "value": v} for k, v in local_storage.items()
                     ]
-                }]
+                }] if local_storage else []
+            }
             
             # Convertir le sessionStorage si présent
             session_storage = session_data.get("session_storage", {})
@@ -11,7 +11,8 @@ import structlog
 
 from ai_interface_actions.config import settings
 from ai_interface_actions.api import app
-from ai_interface_actions.browser_automation import browser_manager
+from ai_interface_actions.browser_automation import browser_manager, stop_shared_playwright
+from ai_interface_actions.credentials_client import credentials_client
 from ai_interface_actions.task_manager import task_manager
 
 logger = structlog.get_logger(__name__)
@@ -21,14 +22,21 @@ class GracefulShutdown:
     """Gestionnaire d'arrêt propre de l'application"""
     
     def __init__(self):
-        self.shutdown_event = asyncio.Event()
-        self.setup_signal_handlers()
+        # Événement créé à la première utilisation, dans la boucle qui sert l'application
+        self._shutdown_event: Optional[asyncio.Event] = None
     
-    def setup_signal_handlers(self):
-        """Configure les gestionnaires de signaux"""
+    @property
+    def shutdown_event(self) -> asyncio.Event:
+        """Événement d'arrêt, lié à la boucle en cours"""
+        if self._shutdown_event is None:
+            self._shutdown_event = asyncio.Event()
+        return self._shutdown_event
+    
+    async def install(self):
+        """Configure les gestionnaires de signaux sur la boucle en cours d'exécution"""
         if sys.platform != "win32":
             # Unix/Linux/MacOS
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             for sig in (signal.SIGTERM, signal.SIGINT):
                 loop.add_signal_handler(sig, self.signal_handler, sig)
         else:
@@ -56,6 +64,10 @@ async def cleanup_resources():
         
         # Nettoyage du navigateur
         await browser_manager.cleanup()
+        await stop_shared_playwright()
+        
+        # Fermeture des connexions HTTP vers l'API de credentials
+        await credentials_client.aclose()
         
         logger.info("Ressources nettoyées avec succès")
         
@@ -68,11 +80,14 @@ def main():
     try:
         logger.info("Démarrage de AI Interface Actions", version="0.1.0")
         
-        # Configuration Uvicorn
+        # Configuration Uvicorn : uvloop et httptools (fournis par uvicorn[standard]) hors Windows
+        use_native_loop = sys.platform != "win32"
         config = uvicorn.Config(
             app,
             host=settings.api_host,
             port=settings.api_port,
+            loop="uvloop" if use_native_loop else "auto",
+            http="httptools" if use_native_loop else "auto",
             reload=settings.debug,
             log_level=settings.log_level.lower(),
             access_log=True,
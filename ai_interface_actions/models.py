@@ -3,7 +3,11 @@ Modèles Pydantic pour les requêtes et réponses de l'API
 """
 from enum import Enum
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Objets de transfert immuables : créés une fois par requête/réponse, jamais modifiés ensuite
+_FROZEN_CONFIG = ConfigDict(frozen=True)
 
 
 class TaskStatus(str, Enum):
@@ -17,6 +21,8 @@ class TaskStatus(str, Enum):
 
 class MessageRequest(BaseModel):
     """Requête pour envoyer un message sur une plateforme IA"""
+    model_config = _FROZEN_CONFIG
+    
     message: str = Field(..., description="Message à envoyer", min_length=1, max_length=10000)
     platform: str = Field(default="manus", description="Plateforme cible (manus, chatgpt, etc.)")
     conversation_url: str = Field(default="", description="URL de conversation existante (optionnel - nouvelle conversation si vide)")
@@ -26,6 +32,8 @@ class MessageRequest(BaseModel):
 
 class MessageResponse(BaseModel):
     """Réponse après envoi d'un message"""
+    model_config = _FROZEN_CONFIG
+    
     task_id: str = Field(..., description="ID unique de la tâche")
     status: TaskStatus = Field(..., description="Statut de la tâche")
     message_sent: str = Field(..., description="Message envoyé")
@@ -37,6 +45,8 @@ class MessageResponse(BaseModel):
 
 class TaskStatusResponse(BaseModel):
     """Réponse pour le statut d'une tâche"""
+    model_config = _FROZEN_CONFIG
+    
     task_id: str = Field(..., description="ID de la tâche")
     status: TaskStatus = Field(..., description="Statut actuel")
     created_at: str = Field(..., description="Date de création")
@@ -53,6 +63,8 @@ class TaskStatusResponse(BaseModel):
 
 class FileUploadRequest(BaseModel):
     """Requête pour uploader un fichier avec message optionnel"""
+    model_config = _FROZEN_CONFIG
+    
     message: str = Field(default="", description="Message accompagnant le fichier (optionnel)", max_length=10000)
     platform: str = Field(default="manus", description="Plateforme cible (manus, chatgpt, etc.)")
     conversation_url: str = Field(default="", description="URL de conversation existante (optionnel - nouvelle conversation si vide)")
@@ -62,6 +74,8 @@ class FileUploadRequest(BaseModel):
 
 class ZipUrlUploadRequest(BaseModel):
     """Requête pour uploader un fichier .zip depuis une URL"""
+    model_config = _FROZEN_CONFIG
+    
     zip_url: str = Field(..., description="URL du fichier .zip à télécharger", min_length=1)
     message: str = Field(default="", description="Message accompagnant le fichier (optionnel)", max_length=10000)
     platform: str = Field(default="manus", description="Plateforme cible (manus, chatgpt, etc.)")
@@ -73,6 +87,8 @@ class ZipUrlUploadRequest(BaseModel):
 
 class FileUploadResponse(BaseModel):
     """Réponse après upload d'un fichier"""
+    model_config = _FROZEN_CONFIG
+    
     task_id: str = Field(..., description="ID unique de la tâche")
     status: TaskStatus = Field(..., description="Statut de la tâche")
     filename: str = Field(..., description="Nom du fichier uploadé")
@@ -85,6 +101,8 @@ class FileUploadResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Réponse de santé de l'API"""
+    model_config = _FROZEN_CONFIG
+    
     status: str = Field(..., description="Statut de l'API")
     version: str = Field(..., description="Version de l'application")
     browser_ready: bool = Field(..., description="Navigateur prêt")
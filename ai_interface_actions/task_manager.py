@@ -2,88 +2,158 @@
 Gestionnaire de tâches asynchrones
 """
 import asyncio
-import uuid
+import heapq
+import secrets
+import sys
+import time
+import weakref
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Set, Tuple
 import structlog
 
+from ai_interface_actions.config import settings
 from ai_interface_actions.models import TaskStatus
+from ai_interface_actions.browser_automation import browser_manager
 
 logger = structlog.get_logger(__name__)
 
+# Statuts des tâches pouvant être nettoyées
+_FINISHED_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED})
+
 
 class Task:
     """Représente une tâche d'automatisation"""
     
+    # Pas de __dict__ par instance : les tâches terminées restent en mémoire pour le suivi du statut
+    __slots__ = ("task_id", "task_type", "params", "status", "created_at_ns", "updated_at_ns",
+                 "result", "error_message", "execution_start_ns", "execution_end_ns", "_wall_epoch",
+                 "_status_cache")
+    
     def __init__(self, task_id: str, task_type: str, params: Dict[str, Any]):
         self.task_id = task_id
-        self.task_type = task_type
+        # Peu de types de tâches distincts : une seule chaîne partagée par type
+        self.task_type = sys.intern(task_type)
         self.params = params
         self.status = TaskStatus.PENDING
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        # Horodatages monotones en ns ; convertis en dates seulement à la lecture (voir _wall_time)
+        self.created_at_ns = time.monotonic_ns()
+        self._wall_epoch = time.time()
+        self.updated_at_ns = self.created_at_ns
         self.result: Optional[Dict[str, Any]] = None
         self.error_message: Optional[str] = None
-        self.execution_start_time: Optional[datetime] = None
-        self.execution_end_time: Optional[datetime] = None
+        self.execution_start_ns: Optional[int] = None
+        self.execution_end_ns: Optional[int] = None
+        # Statut sérialisé pour get_task_status, remis à None par chaque mutation
+        self._status_cache: Optional[Dict[str, Any]] = None
+    
+    def _wall_time(self, ns: int) -> datetime:
+        """Convertit un horodatage monotone en date locale (relative à la création de la tâche)"""
+        return datetime.fromtimestamp(self._wall_epoch + (ns - self.created_at_ns) / 1e9)
+    
+    @property
+    def created_at(self) -> datetime:
+        """Date de création"""
+        return self._wall_time(self.created_at_ns)
+    
+    @property
+    def updated_at(self) -> datetime:
+        """Date de dernière mise à jour"""
+        return self._wall_time(self.updated_at_ns)
     
     @property
     def execution_time_seconds(self) -> Optional[float]:
         """Calcule le temps d'exécution en secondes"""
-        if self.execution_start_time and self.execution_end_time:
-            return (self.execution_end_time - self.execution_start_time).total_seconds()
+        if self.execution_start_ns is not None and self.execution_end_ns is not None:
+            return (self.execution_end_ns - self.execution_start_ns) / 1e9
         return None
     
     def update_status(self, status: TaskStatus, error_message: Optional[str] = None) -> None:
         """Met à jour le statut de la tâche"""
         self.status = status
-        self.updated_at = datetime.now()
+        self.updated_at_ns = time.monotonic_ns()
+        self._status_cache = None
         if error_message:
             self.error_message = error_message
     
     def start_execution(self) -> None:
         """Marque le début de l'exécution"""
         self.status = TaskStatus.RUNNING
-        self.execution_start_time = datetime.now()
-        self.updated_at = datetime.now()
+        self.execution_start_ns = self.updated_at_ns = time.monotonic_ns()
+        self._status_cache = None
     
     def complete_execution(self, result: Dict[str, Any]) -> None:
         """Marque la fin de l'exécution avec succès"""
         self.status = TaskStatus.COMPLETED
-        self.execution_end_time = datetime.now()
-        self.updated_at = datetime.now()
+        self.execution_end_ns = self.updated_at_ns = time.monotonic_ns()
+        self._status_cache = None
         self.result = result
     
     def fail_execution(self, error_message: str) -> None:
         """Marque la fin de l'exécution avec échec"""
         self.status = TaskStatus.FAILED
-        self.execution_end_time = datetime.now()
-        self.updated_at = datetime.now()
+        self.execution_end_ns = self.updated_at_ns = time.monotonic_ns()
+        self._status_cache = None
         self.error_message = error_message
     
     def update_with_url(self, conversation_url: str) -> None:
         """Met à jour la tâche avec l'URL de conversation disponible"""
         self.status = TaskStatus.URL_READY
-        self.updated_at = datetime.now()
+        self.updated_at_ns = time.monotonic_ns()
+        self._status_cache = None
         if not self.result:
             self.result = {}
         self.result["conversation_url"] = conversation_url
-        logger.info("URL de conversation mise à jour", task_id=self.task_id, url=conversation_url)
+        logger.debug("URL de conversation mise à jour", task_id=self.task_id, url=conversation_url)
+
+
+class TokenBucket:
+    """Limiteur de débit à seau à jetons : les rafales de tâches sont étalées au lieu d'être rejetées"""
+    
+    __slots__ = ("capacity", "refill_rate_per_sec", "tokens", "last_ns")
+    
+    def __init__(self, capacity: int, refill_rate_per_sec: float):
+        self.capacity = capacity
+        self.refill_rate_per_sec = refill_rate_per_sec
+        self.tokens = float(capacity)
+        self.last_ns = time.monotonic_ns()
+    
+    async def acquire(self) -> None:
+        """Attend qu'un jeton soit disponible puis le consomme"""
+        while True:
+            now = time.monotonic_ns()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_ns) / 1e9 * self.refill_rate_per_sec)
+            self.last_ns = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.refill_rate_per_sec)
 
 
 class TaskManager:
     """Gestionnaire de tâches asynchrones"""
     
-    def __init__(self):
+    def __init__(self, rate_per_second: Optional[float] = None, burst: Optional[int] = None):
         self.tasks: Dict[str, Task] = {}
-        self.running_tasks: Dict[str, asyncio.Task] = {}
+        # Références faibles : une tâche asyncio terminée n'est jamais retenue par ce suivi
+        self.running_tasks: "weakref.WeakValueDictionary[str, asyncio.Task]" = weakref.WeakValueDictionary()
+        # Références fortes des tâches lancées en arrière-plan (la boucle ne garde que des références faibles)
+        self._background_tasks: Set[asyncio.Task] = set()
         self.max_concurrent_tasks = 5  # Limite de tâches simultanées
+        # Les tâches au-delà de la limite attendent un créneau au lieu d'échouer
+        self._slots = asyncio.Semaphore(self.max_concurrent_tasks)
+        # Débit de démarrage des tâches (paramètres par défaut lus dans la configuration)
+        rate_per_second = settings.task_rate_per_second if rate_per_second is None else rate_per_second
+        burst = settings.task_burst if burst is None else burst
+        self._bucket: Optional[TokenBucket] = TokenBucket(max(burst, 1), rate_per_second) if rate_per_second > 0 else None
+        # Tas (horodatage monotone en ns, task_id) : le nettoyage n'examine que les entrées échues
+        self._expiry_heap: List[Tuple[int, str]] = []
     
     def create_task(self, task_type: str, params: Dict[str, Any]) -> str:
         """Crée une nouvelle tâche"""
-        task_id = str(uuid.uuid4())
+        task_id = secrets.token_hex(16)
         task = Task(task_id, task_type, params)
         self.tasks[task_id] = task
+        heapq.heappush(self._expiry_heap, (task.created_at_ns, task_id))
         
         logger.info("Nouvelle tâche créée", task_id=task_id, task_type=task_type)
         return task_id
@@ -99,18 +169,11 @@ class TaskManager:
             logger.error("Tâche introuvable", task_id=task_id)
             return
         
-        # Vérifier la limite de tâches simultanées
-        if len(self.running_tasks) >= self.max_concurrent_tasks:
-            logger.warning("Limite de tâches simultanées atteinte", task_id=task_id)
-            task.update_status(TaskStatus.FAILED, "Limite de tâches simultanées atteinte")
-            return
-        
-        # Créer et démarrer la tâche asyncio
-        async_task = asyncio.create_task(self._run_task(task))
-        self.running_tasks[task_id] = async_task
+        # Exécution directe : la tâche asyncio courante est enregistrée pour permettre l'annulation
+        self.running_tasks[task_id] = asyncio.current_task()
         
         try:
-            await async_task
+            await self._run_task(task)
         except Exception as e:
             logger.error("Erreur lors de l'exécution de la tâche", task_id=task_id, error=str(e))
         finally:
@@ -118,25 +181,37 @@ class TaskManager:
             self.running_tasks.pop(task_id, None)
     
     async def _run_task(self, task: Task) -> None:
-        """Exécute une tâche spécifique"""
-        try:
-            task.start_execution()
-            logger.info("Début d'exécution de la tâche", task_id=task.task_id, task_type=task.task_type)
+        """Exécute une tâche spécifique (en attente d'un jeton puis d'un créneau si les limites sont atteintes)"""
+        # Jeton pris avant le créneau : l'attente liée au débit n'occupe pas de créneau
+        if self._bucket is not None:
+            await self._bucket.acquire()
+            # Tâche annulée pendant l'attente d'un jeton : ne pas occuper de créneau
+            if task.status is not TaskStatus.PENDING:
+                logger.info("Tâche annulée avant son exécution", task_id=task.task_id)
+                return
+        async with self._slots:
+            # Tâche annulée pendant l'attente d'un créneau : ne pas l'exécuter
+            if task.status is not TaskStatus.PENDING:
+                logger.info("Tâche annulée avant son exécution", task_id=task.task_id)
+                return
+            try:
+                task.start_execution()
+                logger.info("Début d'exécution de la tâche", task_id=task.task_id, task_type=task.task_type)
             
-            if task.task_type == "send_message":
-                result = await self._execute_send_message_task(task)
-            elif task.task_type == "upload_zip_file":
-                result = await self._execute_upload_zip_file_task(task)
-            else:
-                raise ValueError(f"Type de tâche non supporté: {task.task_type}")
+                if task.task_type == "send_message":
+                    result = await self._execute_send_message_task(task)
+                elif task.task_type == "upload_zip_file":
+                    result = await self._execute_upload_zip_file_task(task)
+                else:
+                    raise ValueError(f"Type de tâche non supporté: {task.task_type}")
             
-            task.complete_execution(result)
-            logger.info("Tâche terminée avec succès", task_id=task.task_id, execution_time=task.execution_time_seconds)
+                task.complete_execution(result)
+                logger.info("Tâche terminée avec succès", task_id=task.task_id, execution_time=task.execution_time_seconds)
             
-        except Exception as e:
-            error_msg = str(e)
-            task.fail_execution(error_msg)
-            logger.error("Échec de la tâche", task_id=task.task_id, error=error_msg)
+            except Exception as e:
+                error_msg = str(e)
+                task.fail_execution(error_msg)
+                logger.error("Échec de la tâche", task_id=task.task_id, error=error_msg)
     
     async def _execute_send_message_task(self, task: Task) -> Dict[str, Any]:
         """Exécute une tâche d'envoi de message"""
@@ -152,7 +227,6 @@ class TaskManager:
             raise ValueError("Message vide")
         
         if platform == "manus":
-            from ai_interface_actions.browser_automation import browser_manager
             result = await browser_manager.send_message_to_manus(
                 message=message,
                 conversation_url=conversation_url,
@@ -186,8 +260,6 @@ class TaskManager:
             raise ValueError("Nom de fichier manquant")
         
         if platform == "manus":
-            from ai_interface_actions.browser_automation import browser_manager
-            
             # Créer un callback pour mettre à jour l'URL dès qu'elle est disponible
             async def url_ready_callback(url: str):
                 logger.info("URL de conversation prête, mise à jour de la tâche", task_id=task.task_id, url=url)
@@ -213,18 +285,23 @@ class TaskManager:
     
     async def start_task_in_background(self, task_id: str) -> None:
         """Démarre une tâche en arrière-plan"""
-        asyncio.create_task(self.execute_task(task_id))
+        background_task = asyncio.create_task(self.execute_task(task_id))
+        self._background_tasks.add(background_task)
+        background_task.add_done_callback(self._background_tasks.discard)
     
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Récupère le statut d'une tâche"""
+        """Récupère le statut d'une tâche (mis en cache jusqu'à la prochaine mise à jour, ne pas le modifier)"""
         task = self.get_task(task_id)
         if not task:
             return None
         
+        if task._status_cache is not None:
+            return task._status_cache
+        
         # Extraire les champs de commodité du result
         result = task.result or {}
         
-        return {
+        task._status_cache = {
             "task_id": task.task_id,
             "status": task.status,
             "created_at": task.created_at.isoformat(),
@@ -238,6 +315,7 @@ class TaskManager:
             "ai_response": result.get("ai_response"),
             "filename": result.get("filename")
         }
+        return task._status_cache
     
     def update_task_url(self, task_id: str, conversation_url: str) -> bool:
         """Met à jour l'URL de conversation d'une tâche"""
@@ -251,17 +329,27 @@ class TaskManager:
     
     def cleanup_old_tasks(self, max_age_hours: int = 24) -> None:
         """Nettoie les anciennes tâches terminées"""
-        cutoff_time = datetime.now().timestamp() - (max_age_hours * 3600)
+        now = time.monotonic_ns()
+        cutoff_time = now - max_age_hours * 3600 * 1_000_000_000
         
-        tasks_to_remove = []
-        for task_id, task in self.tasks.items():
-            if (task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED] and 
-                task.updated_at.timestamp() < cutoff_time):
-                tasks_to_remove.append(task_id)
+        heap = self._expiry_heap
+        rescheduled = []
+        while heap and heap[0][0] < cutoff_time:
+            _, task_id = heapq.heappop(heap)
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+            
+            updated_ts = task.updated_at_ns
+            if task.status in _FINISHED_STATUSES and updated_ts < cutoff_time:
+                del self.tasks[task_id]
+                logger.info("Ancienne tâche supprimée", task_id=task_id)
+            else:
+                # Tâche encore active ou mise à jour récemment : la réexaminer plus tard
+                rescheduled.append((updated_ts if updated_ts >= cutoff_time else now, task_id))
         
-        for task_id in tasks_to_remove:
-            del self.tasks[task_id]
-            logger.info("Ancienne tâche supprimée", task_id=task_id)
+        for entry in rescheduled:
+            heapq.heappush(heap, entry)
 
 
 # Instance globale du gestionnaire de tâches
@@ -1,15 +1,27 @@
 """
 Module pour télécharger des fichiers .zip depuis des URLs
 """
+import asyncio
+import functools
 import tempfile
 import os
 import requests
 import structlog
 from typing import Tuple, Optional
-from urllib.parse import urlparse
+from urllib.parse import urlsplit, SplitResult
 
 logger = structlog.get_logger(__name__)
 
+# Taille des blocs lus pendant le streaming (gros blocs : moins d'itérations Python par Mo)
+_CHUNK_SIZE = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_url(zip_url: str) -> SplitResult:
+    """Découpe une URL une seule fois (partagé entre validation et téléchargement)"""
+    return urlsplit(zip_url)
+
+
 class ZipDownloader:
     """Gestionnaire de téléchargement de fichiers .zip"""
     
@@ -17,9 +29,24 @@ class ZipDownloader:
         self.timeout = timeout
         self.max_size = max_size
     
-    def download_zip_from_url(self, zip_url: str) -> Tuple[str, str]:
+    async def download_zip_from_url_async(self, zip_url: str) -> Tuple[str, str]:
+        """
+        Télécharge un fichier .zip depuis une URL dans un thread, sans bloquer la boucle d'événements
+        
+        Args:
+            zip_url: URL du fichier .zip à télécharger
+            
+        Returns:
+            Tuple[str, str]: (chemin_fichier_temporaire, nom_fichier)
+            
+        Raises:
+            Exception: En cas d'erreur de téléchargement
+        """
+        return await asyncio.to_thread(self._download_zip_sync, zip_url)
+    
+    def _download_zip_sync(self, zip_url: str) -> Tuple[str, str]:
         """
-        Télécharge un fichier .zip depuis une URL
+        Télécharge un fichier .zip depuis une URL (bloquant, voir download_zip_from_url_async)
         
         Args:
             zip_url: URL du fichier .zip à télécharger
@@ -34,7 +61,7 @@ class ZipDownloader:
         
         try:
             # Valider l'URL
-            parsed_url = urlparse(zip_url)
+            parsed_url = _parse_url(zip_url)
             if not parsed_url.scheme or not parsed_url.netloc:
                 raise ValueError(f"URL invalide: {zip_url}")
             
@@ -73,16 +100,18 @@ class ZipDownloader:
             try:
                 with os.fdopen(temp_fd, 'wb') as temp_file:
                     downloaded_size = 0
+                    max_size = self.max_size
+                    write = temp_file.write
                     
-                    for chunk in response.iter_content(chunk_size=8192):
+                    for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
                         if chunk:
                             downloaded_size += len(chunk)
                             
                             # Vérifier la taille pendant le téléchargement
-                            if downloaded_size > self.max_size:
-                                raise ValueError(f"Fichier trop volumineux: {downloaded_size} bytes (max: {self.max_size})")
+                            if downloaded_size > max_size:
+                                raise ValueError(f"Fichier trop volumineux: {downloaded_size} bytes (max: {max_size})")
                             
-                            temp_file.write(chunk)
+                            write(chunk)
                 
                 logger.info("Téléchargement terminé avec succès", 
                            filename=filename,
@@ -117,7 +146,7 @@ class ZipDownloader:
             logger.error("Erreur lors du téléchargement", url=zip_url, error=str(e))
             raise Exception(f"Erreur de téléchargement: {str(e)}")
     
-    def validate_zip_url(self, zip_url: str) -> bool:
+    def validate_zip_url(self, zip_url: str) -> Optional[SplitResult]:
         """
         Valide qu'une URL pointe vers un fichier .zip
         
@@ -125,29 +154,29 @@ class ZipDownloader:
             zip_url: URL à valider
             
         Returns:
-            bool: True si l'URL semble valide
+            Optional[SplitResult]: URL découpée si elle semble valide, None sinon
         """
         try:
-            parsed_url = urlparse(zip_url)
+            parsed_url = _parse_url(zip_url)
             
             # Vérifier le schéma
-            if parsed_url.scheme not in ['http', 'https']:
-                return False
+            if parsed_url.scheme not in ('http', 'https'):
+                return None
             
             # Vérifier qu'il y a un domaine
             if not parsed_url.netloc:
-                return False
+                return None
             
             # Vérifier l'extension (optionnel, car certaines URLs n'ont pas d'extension visible)
             path = parsed_url.path.lower()
             if path and not (path.endswith('.zip') or 'zip' in path):
                 logger.warning("URL ne semble pas pointer vers un fichier .zip", url=zip_url)
             
-            return True
+            return parsed_url
             
         except Exception as e:
             logger.error("Erreur lors de la validation de l'URL", url=zip_url, error=str(e))
-            return False
+            return None
 
 
 # Instance globale du téléchargeur